@@ -0,0 +1,59 @@
+"""Цена и выигрыш кэширования рассчитанных значений тренировки.
+
+Основной сценарий — создание тренировки и один отчёт: так пакеты
+обрабатываются в потоке, и кэш здесь только добавляет накладные
+расходы. Повторные отчёты по одному объекту показывают, когда кэш
+окупается.
+
+Запуск: python -m benchmarks.bench_cache [--number N]
+"""
+import argparse
+import timeit
+from typing import Callable, Dict, List, Tuple, Type
+
+import homework
+
+CASES: List[Tuple[Type[homework.Training], Type[homework.Training],
+                  List[float]]] = [
+    (homework.Running, homework.CachedRunning, [15000, 1, 75]),
+    (homework.SportsWalking, homework.CachedSportsWalking,
+     [9000, 1, 75, 180]),
+    (homework.Swimming, homework.CachedSwimming, [720, 1, 80, 25, 40]),
+]
+
+
+def best_time(statement: Callable[[], object], number: int) -> float:
+    """Лучшее время одного вызова в мкс."""
+    return min(timeit.repeat(statement, number=number, repeat=5)
+               ) / number * 1e6
+
+
+def run(number: int) -> Dict[str, Dict[str, Tuple[float, float]]]:
+    """Вернуть время в мкс без кэша и с кэшем для двух сценариев.
+
+    'new' — создание тренировки и один отчёт, 'warm' — повторный отчёт
+    по уже созданному объекту.
+    """
+    results: Dict[str, Dict[str, Tuple[float, float]]] = {}
+    for plain, cached, data in CASES:
+        new: List[float] = [
+            best_time(lambda: cls(*data).show_training_info(), number)
+            for cls in (plain, cached)
+        ]
+        warm: List[float] = [
+            best_time(training.show_training_info, number)
+            for training in (plain(*data), cached(*data))
+        ]
+        results[plain.__name__] = {'new': (new[0], new[1]),
+                                   'warm': (warm[0], warm[1])}
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=100_000)
+    args = parser.parse_args()
+    for name, scenarios in run(args.number).items():
+        for scenario, (plain, cached) in scenarios.items():
+            print(f'{name} [{scenario}]: {plain:.3f} мкс без кэша, '
+                  f'{cached:.3f} мкс с кэшем, {plain / cached:.2f}x')
@@ -0,0 +1,110 @@
+"""Проверка свёртки констант формул в готовые множители.
+
+Классы `Folded*` при создании (`__init_subclass__`) сворачивают
+константы вида спорта в множители и считают по ним. Бенчмарк измеряет
+время вызова `get_spent_calories` для эталонных и свёрнутых классов и
+долю пакетов, на которых результат не совпадает побитово.
+
+Запуск: python -m benchmarks.bench_coefficients [--number N]
+"""
+import argparse
+import random
+import timeit
+from typing import ClassVar, Dict, List, Tuple, Type
+
+import homework
+
+
+class FoldedCoefficients:
+    """Сворачивает константы класса тренировки в множители.
+
+    Имя класса теряет префикс `Folded`, чтобы сообщения о тренировках
+    не отличались от эталонных.
+    """
+
+    KM_MULTIPLIER: ClassVar[float]
+    DISTANCE_MULTIPLIER: ClassVar[float]
+    CALORIES_TIME_MULTIPLIER: ClassVar[float]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.__name__ = cls.__name__.removeprefix('Folded')
+        cls.KM_MULTIPLIER = 1 / cls.M_IN_KM
+        cls.DISTANCE_MULTIPLIER = cls.LEN_STEP / cls.M_IN_KM
+        cls.CALORIES_TIME_MULTIPLIER = cls.MINUTES_IN_HOUR / cls.M_IN_KM
+
+    def get_distance(self) -> float:
+        return self.action * self.DISTANCE_MULTIPLIER
+
+
+class FoldedRunning(FoldedCoefficients, homework.Running):
+    def get_spent_calories(self) -> float:
+        return ((self.CALORIES_SPEED_MULTIPLIER * self.get_mean_speed()
+                 - self.CALORIES_SPEED_DEDUCT)
+                * self.weight * self.duration
+                * self.CALORIES_TIME_MULTIPLIER)
+
+
+class FoldedSportsWalking(FoldedCoefficients, homework.SportsWalking):
+    pass
+
+
+class FoldedSwimming(FoldedCoefficients, homework.Swimming):
+    def get_mean_speed(self) -> float:
+        return (self.length_pool * self.count_pool * self.KM_MULTIPLIER
+                / self.duration)
+
+
+CASES: Dict[str, Tuple[Type[homework.Training], Type[homework.Training]]] = {
+    'RUN': (homework.Running, FoldedRunning),
+    'WLK': (homework.SportsWalking, FoldedSportsWalking),
+    'SWM': (homework.Swimming, FoldedSwimming),
+}
+SAMPLES: Dict[str, List[float]] = {'RUN': [15000, 1, 75],
+                                   'WLK': [9000, 1, 75, 180],
+                                   'SWM': [720, 1, 80, 25, 40]}
+
+
+def mismatch_share(workout_type: str, packages: int) -> float:
+    """Доля пакетов, где свёрнутый расчёт отличается от эталона."""
+    from benchmarks.bench_suite import synthetic_packages
+
+    reference, folded = CASES[workout_type]
+    mismatches: int = 0
+    for _, data in synthetic_packages(packages, workout_type,
+                                      seed=random.randrange(1 << 30)):
+        expected = reference(*data).show_training_info()
+        result = folded(*data).show_training_info()
+        if (expected.distance, expected.speed, expected.calories) != (
+                result.distance, result.speed, result.calories):
+            mismatches += 1
+    return mismatches / packages
+
+
+def run(number: int, packages: int) -> Dict[str, Dict[str, float]]:
+    """Измерить время вызова и расхождения для каждого вида спорта."""
+    results: Dict[str, Dict[str, float]] = {}
+    for workout_type, classes in CASES.items():
+        data: List[float] = SAMPLES[workout_type]
+        timings: List[float] = [
+            min(timeit.repeat(training.get_spent_calories,
+                              number=number, repeat=5)) / number * 1e9
+            for training in (cls(*data) for cls in classes)
+        ]
+        results[workout_type] = {
+            'reference_ns': timings[0],
+            'folded_ns': timings[1],
+            'mismatch_share': mismatch_share(workout_type, packages),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=500_000)
+    parser.add_argument('--packages', type=int, default=100_000)
+    args = parser.parse_args()
+    for workout_type, result in run(args.number, args.packages).items():
+        print(f'{workout_type}: эталон {result["reference_ns"]:.1f} нс, '
+              f'свёртка {result["folded_ns"]:.1f} нс, '
+              f'расхождений {result["mismatch_share"]:.1%}')
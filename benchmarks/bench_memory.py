@@ -0,0 +1,51 @@
+"""Сравнение памяти на одну тренировку для разных представлений.
+
+Запуск: python -m benchmarks.bench_memory [--records N]
+"""
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List
+
+import homework
+
+PACKAGE: List[float] = [15000, 1.5, 75.0]
+
+
+def measure(build: Callable[[int], object], records: int) -> float:
+    """Вернуть число байт на запись для структуры из `records` записей."""
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    storage = build(records)
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del storage
+    return (after - before) / records
+
+
+def build_dataclasses(records: int) -> List[homework.Training]:
+    return [homework.Running(*PACKAGE) for _ in range(records)]
+
+
+def build_slotted(records: int) -> List[homework.Training]:
+    return [homework.SlottedRunning(*PACKAGE) for _ in range(records)]
+
+
+def build_table(records: int) -> homework.WorkoutTable:
+    table = homework.WorkoutTable()
+    table.extend(('RUN', PACKAGE) for _ in range(records))
+    return table
+
+
+def run(records: int) -> Dict[str, float]:
+    """Измерить все представления."""
+    return {'dataclass': measure(build_dataclasses, records),
+            'slotted': measure(build_slotted, records),
+            'WorkoutTable': measure(build_table, records)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=100_000)
+    args = parser.parse_args()
+    for name, per_record in run(args.records).items():
+        print(f'{name}: {per_record:.1f} байт на запись')
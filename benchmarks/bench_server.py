@@ -0,0 +1,86 @@
+"""Нагрузочный клиент для сервиса расчёта тренировок.
+
+Сначала запустите сервис: python homework.py --serve [--unix PATH],
+затем: python -m benchmarks.bench_server --requests 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+PACKAGES: List[bytes] = [
+    json.dumps(package).encode() + b'\n'
+    for package in (['SWM', [720, 1, 80, 25, 40]],
+                    ['RUN', [15000, 1, 75]],
+                    ['WLK', [9000, 1, 75, 180]])
+]
+
+
+async def run_connection(requests: int, pipeline: int,
+                         host: str, port: int, path: Optional[str],
+                         latencies: List[float]) -> None:
+    """Отправить `requests` запросов, держа в полёте не больше `pipeline`."""
+    if path is None:
+        reader, writer = await asyncio.open_connection(host, port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path)
+    window: asyncio.Semaphore = asyncio.Semaphore(pipeline)
+    sent: Deque[float] = deque()
+
+    async def send() -> None:
+        for index in range(requests):
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(PACKAGES[index % len(PACKAGES)])
+            await writer.drain()
+
+    sender: asyncio.Task = asyncio.create_task(send())
+    for _ in range(requests):
+        await reader.readline()
+        latencies.append(time.perf_counter() - sent.popleft())
+        window.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Вернуть перцентиль отсортированного списка."""
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(requests: int, connections: int, pipeline: int,
+              host: str = '127.0.0.1', port: int = 8765,
+              path: Optional[str] = None) -> Dict[str, float]:
+    """Измерить задержки и пропускную способность сервиса."""
+    latencies: List[float] = []
+    started: float = time.perf_counter()
+    await asyncio.gather(*(
+        run_connection(requests // connections, pipeline, host, port, path,
+                       latencies)
+        for _ in range(connections)
+    ))
+    elapsed: float = time.perf_counter() - started
+    latencies.sort()
+    return {'requests': len(latencies),
+            'requests_per_second': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1e3,
+            'p90_ms': percentile(latencies, 0.90) * 1e3,
+            'p99_ms': percentile(latencies, 0.99) * 1e3,
+            'max_ms': latencies[-1] * 1e3}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--connections', type=int, default=10)
+    parser.add_argument('--pipeline', type=int, default=16)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix')
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.requests, args.connections,
+                                     args.pipeline, args.host, args.port,
+                                     args.unix)), indent=2))
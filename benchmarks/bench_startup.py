@@ -0,0 +1,105 @@
+"""Время холодного запуска расчёта одного набора пакетов.
+
+Сравнивает запуск скрипта, запуск модуля (`python -m homework`, байткод
+берётся из кэша) и быстрый клиент `homework_client.py` с прогретым
+сервисом и без него. Точка отсчёта — демонстрационный запуск
+`homework.py` из ревизии `--baseline` (по умолчанию первый коммит
+репозитория). Команды запускаются по очереди в каждом круге, чтобы
+фоновая нагрузка одинаково сказывалась на всех вариантах; байткод
+импортируемых модулей пишется в кэш, как при обычной установке.
+Запуск: python -m benchmarks.bench_startup [--runs N] [--baseline REV]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+PACKAGES: bytes = (b'["SWM", [720, 1, 80, 25, 40]]\n'
+                   b'["RUN", [15000, 1, 75]]\n'
+                   b'["WLK", [9000, 1, 75, 180]]\n')
+
+
+Command = Tuple[List[str], Optional[Dict[str, str]]]
+
+
+def measure(commands: Dict[str, Command], runs: int) -> Dict[str, float]:
+    """Вернуть медианное время запуска каждой команды в мс.
+
+    В каждом из `runs` кругов все команды запускаются по одному разу.
+    """
+    timings: Dict[str, List[float]] = {name: [] for name in commands}
+    for _ in range(runs):
+        for name, (command, env) in commands.items():
+            started: float = time.perf_counter()
+            subprocess.run(command, input=PACKAGES,
+                           stdout=subprocess.DEVNULL, env=env, check=True)
+            timings[name].append(time.perf_counter() - started)
+    return {name: statistics.median(values) * 1e3
+            for name, values in timings.items()}
+
+
+def baseline_revision() -> str:
+    """Вернуть первый коммит репозитория."""
+    return subprocess.run(
+        ['git', 'rev-list', '--max-parents=0', 'HEAD'],
+        capture_output=True, text=True, check=True
+    ).stdout.split()[-1]
+
+
+def baseline_source(revision: str) -> bytes:
+    """Вернуть `homework.py` из ревизии."""
+    return subprocess.run(
+        ['git', 'show', f'{revision}:homework.py'],
+        capture_output=True, check=True
+    ).stdout
+
+
+def run(runs: int, baseline: Optional[str] = None) -> Dict[str, float]:
+    """Измерить все варианты запуска."""
+    python: str = sys.executable
+    revision: str = baseline or baseline_revision()
+    env: Dict[str, str] = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    with tempfile.TemporaryDirectory() as directory:
+        script: str = os.path.join(directory, 'homework.py')
+        with open(script, 'wb') as stream:
+            stream.write(baseline_source(revision))
+        path: str = os.path.join(directory, 'homework.sock')
+        missing: str = os.path.join(directory, 'missing.sock')
+        commands: Dict[str, Command] = {
+            'python -c pass': ([python, '-c', 'pass'], env),
+            f'{revision[:7]}: python homework.py': ([python, script], env),
+            'python homework.py': ([python, 'homework.py'], env),
+            'python homework.py -': ([python, 'homework.py', '-'], env),
+            'python -m homework -': ([python, '-m', 'homework', '-'], env),
+            'python homework_client.py (без сервиса)': (
+                [python, 'homework_client.py'],
+                dict(env, HOMEWORK_SOCKET=missing)
+            ),
+            'python homework_client.py': (
+                [python, 'homework_client.py'],
+                dict(env, HOMEWORK_SOCKET=path)
+            ),
+        }
+        server = subprocess.Popen([python, '-m', 'homework', '--serve',
+                                   '--unix', path, '--output-format', 'text'])
+        try:
+            while not os.path.exists(path):
+                time.sleep(0.01)
+            return measure(commands, runs)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--baseline', help='ревизия для сравнения')
+    args = parser.parse_args()
+    for name, milliseconds in run(args.runs, args.baseline).items():
+        print(f'{name}: {milliseconds:.1f} мс')
@@ -0,0 +1,176 @@
+"""Набор бенчмарков для расчётов и полного пути обработки пакетов.
+
+Запуск:
+    python -m benchmarks.bench_suite --sizes 1000 100000 --output new.json
+    python -m benchmarks.bench_suite --compare old.json new.json
+
+Данные генерируются порциями, поэтому размеры до 1e7 пакетов не требуют
+держать весь набор в памяти. Результаты сохраняются в JSON и сравниваются
+между коммитами: время каждого бенчмарка в нс на вызов.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from operator import methodcaller
+from typing import Callable, Dict, Iterator, List, Optional
+
+import homework
+
+CHUNK_SIZE: int = 10_000
+REPEAT: int = 3
+WORKOUT_CODES: Dict[str, str] = {'Running': 'RUN',
+                                 'SportsWalking': 'WLK',
+                                 'Swimming': 'SWM'}
+
+
+def synthetic_packages(size: int, workout_type: Optional[str] = None,
+                       seed: int = 0) -> Iterator[homework.Package]:
+    """Сгенерировать `size` правдоподобных пакетов датчиков."""
+    rng: random.Random = random.Random(seed)
+    codes: List[str] = ([workout_type] if workout_type
+                        else list(WORKOUT_CODES.values()))
+    for _ in range(size):
+        code: str = rng.choice(codes)
+        data: List[float] = [rng.randint(100, 30000),
+                             round(rng.uniform(0.2, 3.0), 2),
+                             round(rng.uniform(40, 120), 1)]
+        if code == 'WLK':
+            data.append(rng.randint(140, 210))
+        elif code == 'SWM':
+            data.extend([rng.choice((25, 50)), rng.randint(1, 80)])
+        yield code, data
+
+
+def time_chunks(size: int, workout_type: Optional[str],
+                prepare: Callable[[List[homework.Package]], object],
+                measure: Callable[[object], None]) -> float:
+    """Вернуть суммарное время `measure` по всем порциям набора.
+
+    Каждая порция измеряется `REPEAT` раз, в сумму идёт лучшее время.
+    """
+    elapsed: float = 0.0
+    for chunk in homework.chunked(synthetic_packages(size, workout_type),
+                                  CHUNK_SIZE):
+        prepared: object = prepare(chunk)
+        timings: List[float] = []
+        for _ in range(REPEAT):
+            started: float = time.perf_counter()
+            measure(prepared)
+            timings.append(time.perf_counter() - started)
+        elapsed += min(timings)
+    return elapsed
+
+
+def build_trainings(chunk: List[homework.Package]) -> List[homework.Training]:
+    return [homework.read_package(code, data) for code, data in chunk]
+
+
+def build_infos(chunk: List[homework.Package]) -> List[homework.InfoMessage]:
+    return homework.read_infos(chunk)
+
+
+def call_each(method: str) -> Callable[[List[object]], None]:
+    """Вернуть функцию, вызывающую метод `method` у каждого объекта."""
+    call: Callable[[object], object] = methodcaller(method)
+
+    def measure(objects: List[object]) -> None:
+        for item in objects:
+            call(item)
+    return measure
+
+
+def dispatch(chunk: List[homework.Package]) -> None:
+    read_package: Callable = homework.read_package
+    for code, data in chunk:
+        read_package(code, data)
+
+
+def full_path(chunk: List[homework.Package]) -> None:
+    with redirect_stdout(io.StringIO()):
+        for code, data in chunk:
+            homework.main(homework.read_package(code, data))
+
+
+def benchmarks() -> Dict[str, tuple]:
+    """Описания бенчмарков: вид спорта, подготовка и измерение."""
+    suite: Dict[str, tuple] = {
+        'Training.get_distance': (None, build_trainings,
+                                  call_each('get_distance')),
+        'Training.get_mean_speed': (None, build_trainings,
+                                    call_each('get_mean_speed')),
+        'read_package': (None, list, dispatch),
+        'InfoMessage.get_message': (None, build_infos,
+                                    call_each('get_message')),
+        'main': (None, list, full_path),
+    }
+    for name, code in WORKOUT_CODES.items():
+        suite[f'{name}.get_spent_calories'] = (
+            code, build_trainings, call_each('get_spent_calories')
+        )
+    return suite
+
+
+def run(sizes: List[int]) -> Dict[str, object]:
+    """Выполнить все бенчмарки для каждого размера набора."""
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        for name, (code, prepare, measure) in benchmarks().items():
+            seconds: float = time_chunks(size, code, prepare, measure)
+            results[f'{name}@{size}'] = {
+                'seconds': seconds,
+                'ns_per_call': seconds / size * 1e9,
+                'calls_per_second': size / seconds if seconds else 0.0,
+            }
+            print(f'{name}@{size}: '
+                  f'{results[f"{name}@{size}"]["ns_per_call"]:.1f} нс',
+                  file=sys.stderr)
+    return {'meta': {'python': platform.python_version(),
+                     'platform': platform.platform(),
+                     'created': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results}
+
+
+def compare(old: Dict[str, object], new: Dict[str, object],
+            threshold: float) -> List[str]:
+    """Вернуть строки сравнения и отметить замедления выше порога."""
+    lines: List[str] = []
+    for name, result in new['results'].items():
+        before: Optional[Dict[str, float]] = old['results'].get(name)
+        if before is None:
+            continue
+        ratio: float = result['ns_per_call'] / before['ns_per_call']
+        mark: str = ' РЕГРЕССИЯ' if ratio > 1 + threshold else ''
+        lines.append(f'{name}: {before["ns_per_call"]:.1f} -> '
+                     f'{result["ns_per_call"]:.1f} нс ({ratio:.2f}x){mark}')
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000])
+    parser.add_argument('--output', help='файл для результатов в JSON')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='сравнить два файла результатов')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='допустимое замедление (доля)')
+    args = parser.parse_args()
+    if args.compare:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            report: List[str] = compare(json.load(old), json.load(new),
+                                        args.threshold)
+        print('\n'.join(report))
+        sys.exit(any(line.endswith('РЕГРЕССИЯ') for line in report))
+    data: Dict[str, object] = run(args.sizes)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(data, output, indent=2)
+    else:
+        print(json.dumps(data, indent=2))
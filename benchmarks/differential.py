@@ -0,0 +1,257 @@
+"""Дифференциальная проверка альтернативных расчётов против эталона.
+
+Случайные корректные пакеты прогоняются через эталонные классы
+`Running`, `SportsWalking`, `Swimming` и через каждый
+зарегистрированный движок. Для каждого движка считаются наибольшее
+расхождение дистанции, скорости и калорий в ULP, число пакетов, где
+отличается строка `InfoMessage.get_message()`, и пропускная способность.
+
+Запуск:
+    python -m benchmarks.differential --packages 1000000
+    python -m benchmarks.differential --engines batch cached --strict
+
+Новый движок — функция от порции пакетов, возвращающая сообщения
+в том же порядке, — регистрируется декоратором `register_engine`.
+"""
+import argparse
+import json
+import math
+import random
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+import homework
+
+Engine = Callable[[List[homework.Package]], List[homework.InfoMessage]]
+
+CHUNK_SIZE: int = 10_000
+METRICS: Tuple[str, ...] = ('distance', 'speed', 'calories')
+EXAMPLES: int = 5
+ENGINES: Dict[str, Engine] = {}
+FIELD_RANGES: Dict[str, Tuple[float, float]] = {
+    'action': (1, 1_000_000),
+    'duration': (0.001, 24),
+    'weight': (20, 300),
+    'height': (100, 250),
+    'length_pool': (10, 100),
+    'count_pool': (0, 500),
+}
+DOUBLE: struct.Struct = struct.Struct('<d')
+INT64: struct.Struct = struct.Struct('<q')
+
+
+def register_engine(name: str) -> Callable[[Engine], Engine]:
+    """Зарегистрировать альтернативный движок расчёта под именем `name`."""
+    def decorator(engine: Engine) -> Engine:
+        ENGINES[name] = engine
+        return engine
+    return decorator
+
+
+def reference(chunk: List[homework.Package]) -> List[homework.InfoMessage]:
+    """Эталон: исходные классы тренировок без кэшей и профилирования."""
+    return [homework.WORKOUT_TYPES[code](*data).show_training_info()
+            for code, data in chunk]
+
+
+def from_classes(classes: Dict[str, Type[homework.Training]]) -> Engine:
+    """Движок, создающий тренировки из заданных классов."""
+    def engine(chunk: List[homework.Package]) -> List[homework.InfoMessage]:
+        return [classes[code](*data).show_training_info()
+                for code, data in chunk]
+    return engine
+
+
+register_engine('cached')(from_classes({
+    'RUN': homework.CachedRunning,
+    'WLK': homework.CachedSportsWalking,
+    'SWM': homework.CachedSwimming,
+}))
+register_engine('slotted')(from_classes({
+    'RUN': homework.SlottedRunning,
+    'WLK': homework.SlottedSportsWalking,
+    'SWM': homework.SlottedSwimming,
+}))
+
+
+@register_engine('batch')
+def batch(chunk: List[homework.Package]) -> List[homework.InfoMessage]:
+    """Колоночный расчёт `compute_batch` по видам спорта."""
+    positions: Dict[str, List[int]] = {}
+    for position, (code, _) in enumerate(chunk):
+        positions.setdefault(code, []).append(position)
+    infos: List[Optional[homework.InfoMessage]] = [None] * len(chunk)
+    for code, indexes in positions.items():
+        names: Tuple[str, ...] = homework.WORKOUT_FIELDS[code]
+        columns: Dict[str, List[float]] = {
+            name: [chunk[index][1][column] for index in indexes]
+            for column, name in enumerate(names)
+        }
+        results = homework.compute_batch(code, columns)
+        training_type: str = homework.WORKOUT_TYPES[code].__name__
+        for row, index in enumerate(indexes):
+            infos[index] = homework.InfoMessage(
+                training_type, columns['duration'][row],
+                results['distance'][row], results['speed'][row],
+                results['calories'][row]
+            )
+    return infos
+
+
+@register_engine('folded')
+def folded(chunk: List[homework.Package]) -> List[homework.InfoMessage]:
+    """Свёрнутые множители из `benchmarks.bench_coefficients`."""
+    from benchmarks.bench_coefficients import CASES
+
+    return [CASES[code][1](*data).show_training_info()
+            for code, data in chunk]
+
+
+def fuzz_packages(size: int, seed: int = 0
+                  ) -> Iterator[homework.Package]:
+    """Сгенерировать `size` случайных пакетов, проходящих проверку.
+
+    Значения берутся во всём допустимом диапазоне с логарифмически
+    равномерным распределением, чтобы чаще попадать на крайние порядки.
+    """
+    rng: random.Random = random.Random(seed)
+    codes: List[str] = sorted(homework.WORKOUT_TYPES)
+    for _ in range(size):
+        code: str = rng.choice(codes)
+        data: List[float] = []
+        for name in homework.WORKOUT_FIELDS[code]:
+            low, high = FIELD_RANGES[name]
+            if name in ('action', 'count_pool'):
+                data.append(rng.randint(int(low), int(high)))
+            else:
+                data.append(math.exp(rng.uniform(math.log(low),
+                                                 math.log(high))))
+        yield code, data
+
+
+def ordinal(value: float) -> int:
+    """Номер числа в упорядоченной последовательности чисел double."""
+    bits: int = INT64.unpack(DOUBLE.pack(value))[0]
+    return bits if bits >= 0 else -(bits & 0x7FFF_FFFF_FFFF_FFFF)
+
+
+def ulp_distance(first: float, second: float) -> int:
+    """Число представимых чисел double между `first` и `second`."""
+    if math.isnan(first) or math.isnan(second):
+        return 0 if math.isnan(first) and math.isnan(second) else -1
+    return abs(ordinal(first) - ordinal(second))
+
+
+@dataclass
+class EngineReport:
+    """Итоги сравнения одного движка с эталоном."""
+
+    name: str
+    packages: int = 0
+    seconds: float = 0.0
+    message_mismatches: int = 0
+    max_ulp: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(METRICS, 0)
+    )
+    examples: List[Dict[str, object]] = field(default_factory=list)
+
+    @property
+    def packages_per_second(self) -> float:
+        return self.packages / self.seconds if self.seconds else 0.0
+
+    def compare(self, chunk: List[homework.Package],
+                expected: List[homework.InfoMessage],
+                results: List[homework.InfoMessage]) -> None:
+        """Сравнить результаты порции с эталонными."""
+        self.packages += len(chunk)
+        for package, wanted, got in zip(chunk, expected, results):
+            for metric in METRICS:
+                drift: int = ulp_distance(getattr(wanted, metric),
+                                          getattr(got, metric))
+                if drift < 0 or drift > self.max_ulp[metric]:
+                    self.max_ulp[metric] = drift if drift >= 0 else sys.maxsize
+            wanted_message: str = wanted.get_message()
+            got_message: str = got.get_message()
+            if wanted_message != got_message:
+                self.message_mismatches += 1
+                if len(self.examples) < EXAMPLES:
+                    self.examples.append({'package': package,
+                                          'expected': wanted_message,
+                                          'result': got_message})
+
+    def as_dict(self) -> Dict[str, object]:
+        return {'packages': self.packages,
+                'seconds': self.seconds,
+                'packages_per_second': self.packages_per_second,
+                'message_mismatches': self.message_mismatches,
+                'max_ulp': self.max_ulp,
+                'examples': self.examples}
+
+
+def timed(engine: Engine, chunk: List[homework.Package]
+          ) -> Tuple[List[homework.InfoMessage], float]:
+    started: float = time.perf_counter()
+    results: List[homework.InfoMessage] = engine(chunk)
+    return results, time.perf_counter() - started
+
+
+def run(packages: int, engines: Optional[List[str]] = None,
+        seed: int = 0, chunk_size: int = CHUNK_SIZE
+        ) -> Dict[str, EngineReport]:
+    """Прогнать `packages` случайных пакетов через эталон и движки.
+
+    Пакеты генерируются и проверяются порциями, поэтому миллионы
+    пакетов не держатся в памяти одновременно. Отчёт `reference`
+    содержит только пропускную способность эталона.
+    """
+    selected: Dict[str, Engine] = {
+        name: ENGINES[name] for name in (engines or ENGINES)
+    }
+    reports: Dict[str, EngineReport] = {
+        name: EngineReport(name) for name in ('reference', *selected)
+    }
+    for chunk in homework.chunked(fuzz_packages(packages, seed), chunk_size):
+        expected, seconds = timed(reference, chunk)
+        reports['reference'].packages += len(chunk)
+        reports['reference'].seconds += seconds
+        for name, engine in selected.items():
+            results, seconds = timed(engine, chunk)
+            reports[name].seconds += seconds
+            reports[name].compare(chunk, expected, results)
+    return reports
+
+
+def format_report(report: EngineReport) -> str:
+    drift: str = ', '.join(f'{metric} {ulp}'
+                           for metric, ulp in report.max_ulp.items())
+    return (f'{report.name}: {report.packages_per_second:,.0f} пакетов/с; '
+            f'макс. расхождение в ULP: {drift}; '
+            f'несовпадений сообщений: {report.message_mismatches}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--packages', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                        help='движки для проверки (по умолчанию все)')
+    parser.add_argument('--output', help='файл для отчёта в JSON')
+    parser.add_argument('--strict', action='store_true',
+                        help='код возврата 1 при несовпадении сообщений')
+    args = parser.parse_args()
+    reports: Dict[str, EngineReport] = run(args.packages, args.engines,
+                                           args.seed)
+    for report in reports.values():
+        print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({name: report.as_dict()
+                       for name, report in reports.items()},
+                      output, indent=2, ensure_ascii=False)
+    sys.exit(args.strict and any(report.message_mismatches
+                                 for report in reports.values()))
@@ -0,0 +1,220 @@
+"""Показатели по ходу тренировки и итоги по спортсменам."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ClassVar, Deque, Dict, List, Optional
+
+from homework_core import WORKOUT_TYPES, InfoMessage, Training
+
+if TYPE_CHECKING:
+    from datetime import date
+
+
+@dataclass
+class IntervalSample:
+    """Показатели тренировки на момент отсчёта датчика."""
+
+    elapsed: float  # hours since the first sample
+    distance: float
+    interval_speed: float
+    mean_speed: float
+    calories: float
+    splits: int  # completed splits so far
+
+
+class IntervalTracker:
+    """Расчёт показателей по потоку отсчётов (время, накопленное действие).
+
+    Внутри хранится объект тренировки, поля которого обновляются на
+    каждом отсчёте, поэтому используются те же формулы и коэффициенты,
+    что и для итогов тренировки, а отсчёт обрабатывается за O(1).
+    Дистанция отрезков считается как средняя скорость вида спорта,
+    умноженная на время, - для плавания это дистанция по бассейнам.
+    """
+
+    SECONDS_IN_HOUR: ClassVar[int] = 3600
+
+    def __init__(self, workout_type: str, weight: float,
+                 split_km: float = 1.0, **extra: float) -> None:
+        self.training: Training = WORKOUT_TYPES[workout_type](
+            0, 1, weight, **extra
+        )
+        self.split_km: float = split_km
+        self.split_times: List[float] = []
+        self.start: Optional[float] = None
+        self.last_elapsed: float = 0.0
+        self.last_covered: float = 0.0
+
+    def feed(self, timestamp: float, action: int,
+             **updates: float) -> Optional[IntervalSample]:
+        """Учесть отсчёт: время в секундах и накопленное действие.
+
+        `updates` меняет другие накопленные поля, например `count_pool`.
+        Первый отсчёт задаёт начало тренировки и возвращает None.
+        """
+        if self.start is None:
+            self.start = timestamp
+            return None
+        elapsed: float = (timestamp - self.start) / self.SECONDS_IN_HOUR
+        if elapsed <= self.last_elapsed:
+            raise ValueError('Отсчёты должны идти по возрастанию времени')
+        training: Training = self.training
+        training.action = action
+        training.duration = elapsed
+        for name, value in updates.items():
+            setattr(training, name, value)
+        mean_speed: float = training.get_mean_speed()
+        covered: float = mean_speed * elapsed
+        interval_speed: float = ((covered - self.last_covered)
+                                 / (elapsed - self.last_elapsed))
+        next_split: float = self.split_km * (len(self.split_times) + 1)
+        while covered >= next_split and covered > self.last_covered:
+            share: float = ((next_split - self.last_covered)
+                            / (covered - self.last_covered))
+            self.split_times.append(
+                self.last_elapsed + share * (elapsed - self.last_elapsed)
+            )
+            next_split += self.split_km
+        self.last_elapsed = elapsed
+        self.last_covered = covered
+        return IntervalSample(elapsed=elapsed,
+                              distance=training.get_distance(),
+                              interval_speed=interval_speed,
+                              mean_speed=mean_speed,
+                              calories=training.get_spent_calories(),
+                              splits=len(self.split_times))
+
+
+@dataclass
+class WorkoutTotals:
+    """Накопленные итоги по набору тренировок."""
+
+    count: int = 0
+    duration: float = 0.0
+    distance: float = 0.0
+    calories: float = 0.0
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость по всем тренировкам набора."""
+        if not self.duration:
+            return 0.0
+        return self.distance / self.duration
+
+    def add(self, other: 'WorkoutTotals') -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+
+    def subtract(self, other: 'WorkoutTotals') -> None:
+        self.count -= other.count
+        self.duration -= other.duration
+        self.distance -= other.distance
+        self.calories -= other.calories
+
+
+class RollingWindow:
+    """Итоги за последние `days` дней с вытеснением старых дней."""
+
+    def __init__(self, days: int) -> None:
+        from datetime import timedelta
+
+        self.days: int = days
+        self.span: timedelta = timedelta(days=days)
+        self.totals: WorkoutTotals = WorkoutTotals()
+        self.by_day: Dict[date, WorkoutTotals] = {}
+        self.order: Deque[date] = deque()
+
+    def add(self, day: date, totals: WorkoutTotals) -> None:
+        """Учесть итоги дня; дни старше окна не учитываются."""
+        if self.order and day <= self.order[-1] - self.span:
+            return
+        if day not in self.by_day:
+            self.by_day[day] = WorkoutTotals()
+            if not self.order or day > self.order[-1]:
+                self.order.append(day)
+            else:
+                self.order.insert(bisect_left(self.order, day), day)
+        self.by_day[day].add(totals)
+        self.totals.add(totals)
+        start: date = self.order[-1] - self.span
+        while self.order[0] <= start:
+            self.totals.subtract(self.by_day.pop(self.order.popleft()))
+
+
+class WorkoutAggregator:
+    """Инкрементальные итоги тренировок по спортсменам.
+
+    Каждое сообщение сразу добавляется в итоги за всё время, день,
+    ISO-неделю, месяц и скользящее окно последних `rolling_days` дней,
+    отдельно по виду спорта и по всем видам (`training_type=None`).
+    Запросы читают готовые итоги из словарей за O(1).
+    """
+
+    def __init__(self, rolling_days: int = 7) -> None:
+        self.rolling_days: int = rolling_days
+        self.totals: Dict[tuple, WorkoutTotals] = {}
+        self.windows: Dict[tuple, RollingWindow] = {}
+
+    def add(self, athlete: str, day: date, info: InfoMessage) -> None:
+        """Учесть сообщение о тренировке спортсмена за день `day`."""
+        workout: WorkoutTotals = WorkoutTotals(1, info.duration,
+                                               info.distance, info.calories)
+        year, week, _ = day.isocalendar()
+        for training_type in (info.training_type, None):
+            for key in ((athlete, training_type, 'all'),
+                        (athlete, training_type, 'day', day),
+                        (athlete, training_type, 'week', year, week),
+                        (athlete, training_type, 'month', day.year,
+                         day.month)):
+                self.totals.setdefault(key, WorkoutTotals()).add(workout)
+            window_key: tuple = (athlete, training_type)
+            if window_key not in self.windows:
+                self.windows[window_key] = RollingWindow(self.rolling_days)
+            self.windows[window_key].add(day, workout)
+
+    def add_training(self, athlete: str, day: date,
+                     training: Training) -> None:
+        """Учесть тренировку спортсмена за день `day`."""
+        self.add(athlete, day, training.show_training_info())
+
+    def total(self, athlete: str,
+              training_type: Optional[str] = None) -> WorkoutTotals:
+        """Итоги спортсмена за всё время."""
+        return self.totals.get((athlete, training_type, 'all'),
+                               WorkoutTotals())
+
+    def daily(self, athlete: str, day: date,
+              training_type: Optional[str] = None) -> WorkoutTotals:
+        """Итоги спортсмена за день."""
+        return self.totals.get((athlete, training_type, 'day', day),
+                               WorkoutTotals())
+
+    def weekly(self, athlete: str, day: date,
+               training_type: Optional[str] = None) -> WorkoutTotals:
+        """Итоги спортсмена за ISO-неделю, в которую входит `day`."""
+        year, week, _ = day.isocalendar()
+        return self.totals.get((athlete, training_type, 'week', year, week),
+                               WorkoutTotals())
+
+    def monthly(self, athlete: str, day: date,
+                training_type: Optional[str] = None) -> WorkoutTotals:
+        """Итоги спортсмена за месяц, в который входит `day`."""
+        return self.totals.get(
+            (athlete, training_type, 'month', day.year, day.month),
+            WorkoutTotals()
+        )
+
+    def rolling(self, athlete: str,
+                training_type: Optional[str] = None) -> WorkoutTotals:
+        """Итоги спортсмена за последние `rolling_days` дней.
+
+        Окно отсчитывается от самого позднего дня тренировок спортсмена.
+        """
+        window: Optional[RollingWindow] = self.windows.get(
+            (athlete, training_type)
+        )
+        return WorkoutTotals() if window is None else window.totals
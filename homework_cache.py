@@ -0,0 +1,84 @@
+"""Кэш рассчитанных сообщений для повторяющихся пакетов."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from homework_core import InfoMessage, PackageError, Training, read_package
+from homework_types import Package
+
+
+class ResultCache:
+    """Кэш сообщений о тренировках по содержимому пакета.
+
+    Хранит не больше `maxsize` сообщений, вытесняя давно не
+    использованные; при заданном `ttl` запись живёт `ttl` секунд.
+    Ключ - код тренировки и `repr` данных, поэтому пакеты, которые
+    дали бы разный вывод (например, 1 и 1.0), не смешиваются.
+    Возвращаемые сообщения общие для всех попаданий, их нельзя изменять.
+    """
+
+    def __init__(self, maxsize: int = 100_000,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self.clock: Callable[[], float] = clock
+        self.entries: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_info(self, workout_type: str,
+                 data: Sequence[float]) -> Optional[InfoMessage]:
+        """Вернуть сообщение о тренировке из кэша или рассчитать его."""
+        key: Tuple[str, str] = (workout_type, repr(data))
+        entry: Optional[Tuple[InfoMessage, float]] = self.entries.get(key)
+        if entry is not None:
+            if self.ttl is None or entry[1] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self.entries[key]
+            self.expirations += 1
+        self.misses += 1
+        training: Optional[Training] = read_package(workout_type, data)
+        if training is None:
+            return None
+        info: InfoMessage = training.show_training_info()
+        expires: float = (0.0 if self.ttl is None
+                          else self.clock() + self.ttl)
+        self.entries[key] = (info, expires)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return info
+
+    def read_infos(self, chunk: Iterable[Package]) -> List[InfoMessage]:
+        """Вариант `read_infos`, использующий кэш."""
+        infos: List[InfoMessage] = []
+        for workout_type, data in chunk:
+            info: Optional[InfoMessage] = self.get_info(workout_type, data)
+            if info is None:
+                raise PackageError(
+                    f'Неизвестный код тренировки: {workout_type}'
+                )
+            infos.append(info)
+        return infos
+
+    def get_stats(self) -> Dict[str, float]:
+        """Вернуть статистику попаданий и вытеснений."""
+        requests: int = self.hits + self.misses
+        return {'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / requests if requests else 0.0}
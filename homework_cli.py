@@ -0,0 +1,156 @@
+"""Разбор ключей командной строки и выбор режима работы.
+
+Запуск без ключей `homework.run_cli` обрабатывает сам, не загружая
+этот модуль и `argparse`. Модули режимов импортируются только для
+выбранного режима.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import TYPE_CHECKING, Iterable, List, Optional, TextIO
+
+import homework
+from homework_cache import ResultCache
+from homework_core import CLI_DEFAULTS, OUTPUT_FORMATS, read_source, run_stream
+from homework_export import COLUMNAR_COMPRESSIONS
+from homework_shards import CLAIM_LEASE
+from homework_types import Package
+
+if TYPE_CHECKING:
+    from homework_parallel import ThroughputStats
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description=homework.__doc__.splitlines()[0]
+    )
+    parser.add_argument('source', nargs='?',
+                        help="файл с пакетами или '-' для stdin")
+    parser.add_argument('--format', choices=('json', 'csv', 'binary'),
+                        default=CLI_DEFAULTS['format'],
+                        help='формат входных пакетов')
+    parser.add_argument('--chunk-size', type=int,
+                        default=CLI_DEFAULTS['chunk_size'],
+                        help='количество пакетов в одной порции')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='число процессов; 0 - без пула процессов')
+    parser.add_argument('--unordered', action='store_true',
+                        help='печатать результаты в порядке готовности')
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                        help="формат вывода результатов; по умолчанию "
+                             "'text', для сервиса - 'jsonl'")
+    parser.add_argument('--export', metavar='PATH',
+                        help='выгрузить результаты и исходные поля '
+                             'в колоночный файл вместо вывода')
+    parser.add_argument('--export-compression',
+                        choices=COLUMNAR_COMPRESSIONS, default='zlib',
+                        help='сжатие колонок выгрузки')
+    parser.add_argument('--dead-letter', metavar='PATH',
+                        help='файл для отклонённых пакетов; без него '
+                             'первый некорректный пакет прерывает работу')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='размер кэша результатов; 0 - без кэша')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='время жизни записи кэша в секундах')
+    parser.add_argument('--profile', metavar='PATH',
+                        help="записать метрики этапов при выходе ('-' - "
+                             'в stderr)')
+    parser.add_argument('--coordinator', metavar='WORK_DIR',
+                        help='обработать пакеты шардами в рабочих '
+                             'процессах через общий каталог')
+    parser.add_argument('--worker', metavar='WORK_DIR',
+                        help='обрабатывать шарды из общего каталога')
+    parser.add_argument('--shard-size', type=int, default=10_000,
+                        help='количество пакетов в шарде')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='число повторов для шарда с ошибкой')
+    parser.add_argument('--lease', type=float, default=CLAIM_LEASE,
+                        help='через сколько секунд без обновлений захват '
+                             'шарда считается брошенным')
+    parser.add_argument('--serve', action='store_true',
+                        help='запустить сервис вместо обработки пакетов')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='адрес TCP-сервиса')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='порт TCP-сервиса')
+    parser.add_argument('--unix', help='путь к Unix-сокету сервиса')
+    parser.add_argument('--max-concurrency', type=int, default=100,
+                        help='число одновременно обслуживаемых соединений')
+    return parser.parse_args(argv)
+
+
+def run_local(args: argparse.Namespace, packages: Iterable[Package],
+              dead_letter: Optional[TextIO]) -> None:
+    """Обработать пакеты в текущем процессе, при необходимости с кэшем."""
+    cache: Optional[ResultCache] = (
+        ResultCache(args.cache_size, args.cache_ttl)
+        if args.cache_size else None
+    )
+    run_stream(packages, args.chunk_size,
+               args.output_format or CLI_DEFAULTS['output_format'],
+               cache=cache, dead_letter=dead_letter)
+    if cache is not None:
+        import json
+
+        print(json.dumps(cache.get_stats()), file=sys.stderr)
+
+
+def run_mode(args: argparse.Namespace, packages: Iterable[Package],
+             dead_letter: Optional[TextIO]) -> None:
+    """Выбрать режим работы по аргументам командной строки."""
+    fmt: str = args.output_format or CLI_DEFAULTS['output_format']
+    if args.serve:
+        from homework_service import run_service
+
+        run_service(args)
+    elif args.worker:
+        from homework_shards import run_worker
+
+        run_worker(args.worker, fmt, args.chunk_size)
+    elif args.coordinator:
+        from homework_shards import run_coordinator
+
+        stats: ThroughputStats = run_coordinator(
+            packages, args.coordinator, args.workers or 2, args.shard_size,
+            args.retries, fmt, chunk_size=args.chunk_size,
+            dead_letter=dead_letter, lease=args.lease
+        )
+        print(stats.get_message(), file=sys.stderr)
+    elif args.export:
+        from homework_export import export_columnar
+        from homework_validate import iter_valid
+
+        if dead_letter is not None:
+            packages = iter_valid(packages, dead_letter, args.chunk_size)
+        export_columnar(packages, args.export,
+                        compression=args.export_compression)
+    elif args.workers:
+        from homework_parallel import run_parallel
+
+        stats = run_parallel(packages, args.chunk_size, args.workers,
+                             ordered=not args.unordered, fmt=fmt,
+                             dead_letter=dead_letter)
+        print(stats.get_message(), file=sys.stderr)
+    else:
+        run_local(args, packages, dead_letter)
+
+
+def run_cli(argv: Optional[List[str]] = None) -> None:
+    """Выполнить команду, заданную аргументами командной строки."""
+    args: argparse.Namespace = parse_args(argv)
+    if args.profile:
+        from homework_profile import enable_profiling
+
+        enable_profiling(args.profile)
+    dead_letter: Optional[TextIO] = (
+        None if args.dead_letter is None
+        else open(args.dead_letter, 'a', encoding='utf-8')
+    )
+    try:
+        run_mode(args, read_source(args.source, args.format, dead_letter),
+                 dead_letter)
+    finally:
+        if dead_letter is not None:
+            dead_letter.close()
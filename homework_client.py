@@ -0,0 +1,83 @@
+"""Быстрый запуск расчёта тренировок через прогретый сервис.
+
+Скрипт импортирует только стандартные модули для работы с сокетом и
+передаёт JSON-строки пакетов из stdin сервису, запущенному заранее:
+
+    python -m homework --serve --unix /tmp/homework.sock --output-format text
+    python homework_client.py < packages.jsonl
+
+Путь к сокету задаётся переменной окружения HOMEWORK_SOCKET. Если сервис
+недоступен, пакеты обрабатываются в этом же процессе модулем
+`homework_core`.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import socket
+
+SOCKET_PATH: str = os.environ.get('HOMEWORK_SOCKET', '/tmp/homework.sock')
+
+
+def send_all(connection: socket.socket, data: bytes) -> None:
+    """Отправить запросы и сообщить сервису о конце ввода."""
+    import socket
+
+    connection.sendall(data)
+    connection.shutdown(socket.SHUT_WR)
+
+
+def run_local(data: bytes) -> None:
+    """Обработать пакеты без сервиса.
+
+    Загружается только `homework_core`: модули режимов и `argparse`
+    этому пути не нужны.
+    """
+    import io
+
+    import homework_core
+
+    homework_core.run_stream(
+        homework_core.iter_packages(io.StringIO(data.decode('utf-8')), 'json')
+    )
+
+
+def main() -> None:
+    """Передать stdin сервису и напечатать его ответы.
+
+    Без файла сокета `socket` не импортируется: сразу выполняется
+    локальный расчёт.
+    """
+    data: bytes = sys.stdin.buffer.read()
+    if not os.path.exists(SOCKET_PATH):
+        run_local(data)
+        return
+    import socket
+
+    connection: socket.socket = socket.socket(socket.AF_UNIX)
+    try:
+        connection.connect(SOCKET_PATH)
+    except OSError:
+        connection.close()
+        run_local(data)
+        return
+    import threading
+
+    sender: threading.Thread = threading.Thread(target=send_all,
+                                                args=(connection, data))
+    sender.start()
+    output = sys.stdout.buffer
+    while True:
+        chunk: bytes = connection.recv(1 << 16)
+        if not chunk:
+            break
+        output.write(chunk)
+    sender.join()
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
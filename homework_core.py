@@ -0,0 +1,672 @@
+"""Классы тренировок, реестр видов спорта, чтение пакетов и вывод.
+
+Это всё, что нужно запуску `python homework.py [SOURCE]`, поэтому модуль
+не импортирует `typing` во время выполнения: аннотации здесь не
+вычисляются, а константы классов объявлены без `ClassVar`, чтобы
+`dataclass` не принял их за поля. Код отдельных режимов импортируется
+внутри функций из модулей `homework_*`.
+
+Потокобезопасность: методы `Training`, `InfoMessage`, функции
+`read_package`, `get_report`, `compute_batch` и `validate_package` только
+читают поля объектов и реестр видов спорта, поэтому их можно вызывать
+из разных потоков одновременно, в том числе для одних и тех же объектов.
+Изменять поля тренировки во время чтения из других потоков нельзя.
+`register_workout` вызывается до запуска потоков. `ResultCache`,
+`WorkoutAggregator`, `WorkoutStore`, `Profiler` и классы с кэшем
+(`CachedRunning` и др.) хранят изменяемое состояние и требуют внешней
+блокировки. `main` печатает в stdout; в многопоточном коде используйте
+`get_report` или `process_concurrently`.
+"""
+from __future__ import annotations
+
+import io
+import struct
+import sys
+from array import array
+from itertools import islice
+from time import perf_counter
+from dataclasses import dataclass, fields
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                        Sequence, TextIO, Tuple, Type)
+
+    from homework_cache import ResultCache
+    from homework_profile import Profiler
+    from homework_types import Package
+
+
+@dataclass(
+           repr=False,
+           eq=False
+           )
+class InfoMessage:
+    """Информационное сообщение о тренировке."""
+
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+
+    def get_message(self) -> str:
+        """Вернуть строку сообщения"""
+        info_message: str = (f'Тип тренировки: {self.training_type};'
+                             f' Длительность: {self.duration:.3f} ч.;'
+                             f' Дистанция: {self.distance:.3f} км;'
+                             f' Ср. скорость: {self.speed:.3f} км/ч;'
+                             f' Потрачено ккал: {self.calories:.3f}.'
+                             )
+        return info_message
+
+    def as_row(self) -> Tuple[str, float, float, float, float]:
+        """Вернуть поля сообщения без округления."""
+        return (self.training_type, self.duration, self.distance,
+                self.speed, self.calories)
+
+
+@dataclass(
+           repr=False,
+           eq=False
+           )
+class Training:
+    """Базовый класс тренировки."""
+    LEN_STEP = 0.65  # length of one step
+    M_IN_KM = 1000  # m in km
+    MINUTES_IN_HOUR = 60
+    INFO_MESSAGE = InfoMessage
+
+    action: int
+    duration: float
+    weight: float
+
+    def get_distance(self) -> float:
+        """Получить дистанцию в км."""
+        distance_pass: float = self.action * self.LEN_STEP / self.M_IN_KM
+        return distance_pass
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость движения."""
+        mean_speed: float = self.get_distance() / self.duration
+        return mean_speed
+
+    def get_spent_calories(self) -> float:
+        """Получить количество затраченных калорий."""
+        raise NotImplementedError(f'Определите run '
+                                  f'в {self.__class__.__name__}')
+
+    @classmethod
+    def get_batch_distance(cls,
+                           columns: Dict[str, Sequence[float]]
+                           ) -> List[float]:
+        """Получить дистанции в км для колонок пакетов."""
+        len_step: float = cls.LEN_STEP
+        m_in_km: int = cls.M_IN_KM
+        return [action * len_step / m_in_km for action in columns['action']]
+
+    @classmethod
+    def get_batch_mean_speed(cls,
+                             columns: Dict[str, Sequence[float]],
+                             distance: Sequence[float]
+                             ) -> List[float]:
+        """Получить средние скорости для колонок пакетов."""
+        return [dist / duration
+                for dist, duration in zip(distance, columns['duration'])]
+
+    @classmethod
+    def get_batch_spent_calories(cls,
+                                 columns: Dict[str, Sequence[float]],
+                                 speed: Sequence[float]
+                                 ) -> List[float]:
+        """Получить затраченные калории для колонок пакетов."""
+        raise NotImplementedError(f'Определите run '
+                                  f'в {cls.__name__}')
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть информационное сообщение о выполненной тренировке."""
+
+        return self.INFO_MESSAGE(training_type=self.__class__.__name__,
+                                 duration=self.duration,
+                                 distance=self.get_distance(),
+                                 speed=self.get_mean_speed(),
+                                 calories=self.get_spent_calories()
+                                 )
+
+
+class PackageError(ValueError):
+    """Пакет датчиков нельзя превратить в тренировку."""
+
+
+WORKOUT_TYPES: Dict[str, Type[Training]] = {}
+WORKOUT_ARITY: Dict[str, int] = {}
+WORKOUT_FIELDS: Dict[str, Tuple[str, ...]] = {}
+WIRE_TAGS: Dict[str, int] = {}
+WIRE_FORMATS: Dict[int, Tuple[str, struct.Struct]] = {}
+
+
+def register_workout(workout_type: str,
+                     wire_tag: Optional[int] = None
+                     ) -> Callable[[Type[Training]], Type[Training]]:
+    """Зарегистрировать класс тренировки под кодом `workout_type`.
+
+    Класс проверяется один раз при регистрации: он должен быть
+    датаклассом-наследником `Training` с собственным расчётом калорий.
+    Число полей запоминается для проверки длины пакетов. Если задан
+    `wire_tag`, для класса создаётся двоичный формат записи: байт типа,
+    `action` как uint32 и остальные поля как float64 (little-endian).
+    """
+    def register(cls: Type[Training]) -> Type[Training]:
+        if not (isinstance(cls, type) and issubclass(cls, Training)):
+            raise TypeError(f'{cls!r} не является классом тренировки')
+        if workout_type in WORKOUT_TYPES:
+            raise ValueError(f'Код тренировки {workout_type} уже занят '
+                             f'классом {WORKOUT_TYPES[workout_type].__name__}')
+        if cls.get_spent_calories is Training.get_spent_calories:
+            raise TypeError(f'Определите get_spent_calories '
+                            f'в {cls.__name__}')
+        if wire_tag is not None and not 0 < wire_tag < 256:
+            raise ValueError(f'Байт типа должен быть от 1 до 255, '
+                             f'получено {wire_tag}')
+        if wire_tag in WIRE_FORMATS:
+            raise ValueError(f'Байт типа {wire_tag} уже занят '
+                             f'кодом {WIRE_FORMATS[wire_tag][0]}')
+        WORKOUT_TYPES[workout_type] = cls
+        WORKOUT_ARITY[workout_type] = len(fields(cls))
+        WORKOUT_FIELDS[workout_type] = tuple(field.name
+                                             for field in fields(cls))
+        if wire_tag is not None:
+            WIRE_TAGS[workout_type] = wire_tag
+            WIRE_FORMATS[wire_tag] = (
+                workout_type,
+                struct.Struct('<xI' + 'd' * (len(fields(cls)) - 1))
+            )
+        return cls
+    return register
+
+
+def load_workout_plugins(group: str = 'homework.workouts') -> List[str]:
+    """Зарегистрировать классы тренировок из точек входа пакетов.
+
+    Имя точки входа становится кодом тренировки. Возвращает коды
+    зарегистрированных классов.
+    """
+    from importlib.metadata import entry_points
+
+    loaded: List[str] = []
+    for entry_point in entry_points(group=group):
+        register_workout(entry_point.name)(entry_point.load())
+        loaded.append(entry_point.name)
+    return loaded
+
+
+@register_workout('RUN', wire_tag=1)
+@dataclass(
+           repr=False,
+           eq=False
+           )
+class Running(Training):
+    """Тренировка: бег."""
+    CALORIES_SPEED_MULTIPLIER = 18
+    CALORIES_SPEED_DEDUCT = 20
+
+    def get_spent_calories(self) -> float:
+        spent_calories: float = ((self.CALORIES_SPEED_MULTIPLIER
+                                 * self.get_mean_speed()
+                                 - self.CALORIES_SPEED_DEDUCT) * self.weight
+                                 / self.M_IN_KM * self.duration
+                                 * self.MINUTES_IN_HOUR)
+        return spent_calories
+
+    @classmethod
+    def get_batch_spent_calories(cls,
+                                 columns: Dict[str, Sequence[float]],
+                                 speed: Sequence[float]
+                                 ) -> List[float]:
+        multiplier: float = cls.CALORIES_SPEED_MULTIPLIER
+        deduct: float = cls.CALORIES_SPEED_DEDUCT
+        m_in_km: int = cls.M_IN_KM
+        minutes_in_hour: float = cls.MINUTES_IN_HOUR
+        return [((multiplier * mean_speed - deduct) * weight
+                 / m_in_km * duration * minutes_in_hour)
+                for mean_speed, weight, duration
+                in zip(speed, columns['weight'], columns['duration'])]
+
+
+@register_workout('WLK', wire_tag=2)
+@dataclass(
+           repr=False,
+           eq=False
+           )
+class SportsWalking(Training):
+    """Тренировка: спортивная ходьба."""
+    CALORIES_WHEIGHT_MULTIPLYER = 0.035
+    MEAN_SPEED_POWER = 2
+    SECOND_WHEIGHT_MULTIPLYER = 0.029
+
+    height: float  # user's height in m
+
+    def get_spent_calories(self) -> float:
+        spent_calories: float = ((self.CALORIES_WHEIGHT_MULTIPLYER
+                                 * self.weight
+                                 + ((self.get_mean_speed()
+                                     ** self.MEAN_SPEED_POWER)
+                                     // self.height)
+                                 * self.SECOND_WHEIGHT_MULTIPLYER
+                                 * self.weight)
+                                 * self.duration * self.MINUTES_IN_HOUR)
+        return spent_calories
+
+    @classmethod
+    def get_batch_spent_calories(cls,
+                                 columns: Dict[str, Sequence[float]],
+                                 speed: Sequence[float]
+                                 ) -> List[float]:
+        weight_multiplier: float = cls.CALORIES_WHEIGHT_MULTIPLYER
+        speed_power: int = cls.MEAN_SPEED_POWER
+        second_multiplier: float = cls.SECOND_WHEIGHT_MULTIPLYER
+        minutes_in_hour: float = cls.MINUTES_IN_HOUR
+        return [((weight_multiplier * weight
+                  + ((mean_speed ** speed_power) // height)
+                  * second_multiplier * weight)
+                 * duration * minutes_in_hour)
+                for mean_speed, weight, height, duration
+                in zip(speed, columns['weight'], columns['height'],
+                       columns['duration'])]
+
+
+@register_workout('SWM', wire_tag=3)
+@dataclass(
+           repr=False,
+           eq=False
+           )
+class Swimming(Training):
+    """Тренировка: плавание."""
+
+    LEN_STEP = 1.38
+    CALORIE_SPEED_SUMMAND = 1.1
+    CALORIES_SPEED_MULTIPL = 2
+
+    length_pool: float
+    count_pool: float
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость движения."""
+        mean_speed: float = (self.length_pool * self.count_pool
+                             / self.M_IN_KM / self.duration)
+        return mean_speed
+
+    def get_spent_calories(self) -> float:
+        spent_calories: float = ((self.get_mean_speed()
+                                  + self.CALORIE_SPEED_SUMMAND)
+                                 * self.CALORIES_SPEED_MULTIPL * self.weight)
+        return spent_calories
+
+    @classmethod
+    def get_batch_mean_speed(cls,
+                             columns: Dict[str, Sequence[float]],
+                             distance: Sequence[float]
+                             ) -> List[float]:
+        m_in_km: int = cls.M_IN_KM
+        return [length_pool * count_pool / m_in_km / duration
+                for length_pool, count_pool, duration
+                in zip(columns['length_pool'], columns['count_pool'],
+                       columns['duration'])]
+
+    @classmethod
+    def get_batch_spent_calories(cls,
+                                 columns: Dict[str, Sequence[float]],
+                                 speed: Sequence[float]
+                                 ) -> List[float]:
+        summand: float = cls.CALORIE_SPEED_SUMMAND
+        multiplier: float = cls.CALORIES_SPEED_MULTIPL
+        return [(mean_speed + summand) * multiplier * weight
+                for mean_speed, weight in zip(speed, columns['weight'])]
+
+
+def read_package(workout_type: str, data: List[int]) -> Optional[Training]:
+    """Прочитать данные полученные от датчиков.
+
+    Для неизвестного кода тренировки возвращает None, для пакета
+    неверной длины выбрасывает `PackageError`.
+    """
+    training_type: Optional[Type[Training]] = WORKOUT_TYPES.get(workout_type)
+    if training_type is None:
+        return None
+    if len(data) != WORKOUT_ARITY[workout_type]:
+        raise PackageError(f'Для {workout_type} нужно '
+                           f'{WORKOUT_ARITY[workout_type]} значений, '
+                           f'получено {len(data)}')
+    return training_type(*data)
+
+
+def compute_batch(workout_type: str,
+                  arrays: Dict[str, Sequence[float]]
+                  ) -> Dict[str, array]:
+    """Рассчитать дистанцию, скорость и калории для пакета тренировок.
+
+    Колонки `arrays` называются как поля класса тренировки ('action',
+    'duration', 'weight' и поля вида спорта). Результаты побитово
+    совпадают с методами экземпляров и возвращаются в буферах
+    `array('d')`, которые numpy читает без копирования
+    (`numpy.frombuffer`).
+    """
+    training_type: Type[Training] = WORKOUT_TYPES[workout_type]
+    distance: List[float] = training_type.get_batch_distance(arrays)
+    speed: List[float] = training_type.get_batch_mean_speed(arrays, distance)
+    calories: List[float] = training_type.get_batch_spent_calories(
+        arrays, speed
+    )
+    return {'distance': array('d', distance),
+            'speed': array('d', speed),
+            'calories': array('d', calories)
+            }
+
+
+PROFILER: Optional[Profiler] = None
+
+
+def main(training: Training) -> None:
+    """Главная функция."""
+    if PROFILER is not None:
+        from homework_profile import profile_info
+
+        infos: List[InfoMessage] = [profile_info(PROFILER, training)]
+        sys.stdout.write(render_messages(infos))
+        return
+    info: InfoMessage = training.show_training_info()
+    print(info.get_message())
+
+
+def get_report(training: Training) -> str:
+    """Вернуть строку сообщения о тренировке без вывода в stdout."""
+    return training.show_training_info().get_message()
+
+
+def report_package(workout_type: str, data: Sequence[float]) -> str:
+    """Вернуть строку сообщения для пакета датчиков."""
+    training: Optional[Training] = read_package(workout_type, data)
+    if training is None:
+        raise PackageError(f'Неизвестный код тренировки: {workout_type}')
+    return get_report(training)
+
+
+def process_concurrently(packages: Iterable[Package],
+                         max_workers: Optional[int] = None) -> List[str]:
+    """Рассчитать сообщения для пакетов в пуле потоков.
+
+    Результаты возвращаются в порядке пакетов, ничего не печатается.
+    Расчёт не освобождает GIL, поэтому функция нужна для встраивания
+    в многопоточные серверы, а не для ускорения: для ускорения
+    используйте `run_parallel`.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda package: report_package(*package),
+                                 packages))
+
+
+def parse_number(value: str) -> float:
+    """Разобрать число из текстового поля пакета."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_json_package(line: str) -> Package:
+    """Разобрать пакет датчиков из JSON-строки."""
+    import json
+
+    record = json.loads(line)
+    if isinstance(record, dict):
+        return record['workout_type'], record['data']
+    workout_type, data = record
+    return workout_type, data
+
+
+def iter_packages(stream: TextIO, fmt: str = 'json',
+                  dead_letter: Optional[TextIO] = None) -> Iterator[Package]:
+    """Лениво читать пакеты датчиков из построчного потока.
+
+    Формат 'json': `["SWM", [720, 1, 80, 25, 40]]` или
+    `{"workout_type": "SWM", "data": [...]}` в каждой строке.
+    Формат 'csv': `SWM,720,1,80,25,40`. Пустые строки пропускаются.
+    Если задан `dead_letter`, строки, которые не удалось разобрать,
+    записываются туда вместо выброса исключения.
+    """
+    if fmt == 'json':
+        return iter_json_packages(stream, dead_letter)
+    if fmt == 'csv':
+        return iter_csv_packages(stream, dead_letter)
+    raise ValueError(f'Неизвестный формат пакетов: {fmt}')
+
+
+def iter_json_packages(stream: TextIO,
+                       dead_letter: Optional[TextIO] = None
+                       ) -> Iterator[Package]:
+    """Читать пакеты из строк JSON."""
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield parse_json_package(line)
+        except (ValueError, TypeError, KeyError) as error:
+            if dead_letter is None:
+                raise
+            from homework_validate import write_dead_letter
+
+            write_dead_letter(dead_letter, f'Ошибка разбора: {error}',
+                              line=line.rstrip('\n'))
+
+
+def iter_csv_packages(stream: TextIO,
+                      dead_letter: Optional[TextIO] = None
+                      ) -> Iterator[Package]:
+    """Читать пакеты из строк CSV."""
+    import csv
+
+    for row in csv.reader(stream):
+        if not row:
+            continue
+        try:
+            yield row[0], [parse_number(value) for value in row[1:]]
+        except ValueError as error:
+            if dead_letter is None:
+                raise
+            from homework_validate import write_dead_letter
+
+            write_dead_letter(dead_letter, f'Ошибка разбора: {error}',
+                              line=','.join(row))
+
+
+def chunked(packages: Iterable[Package],
+            chunk_size: int) -> Iterator[List[Package]]:
+    """Разбить поток пакетов на списки длиной не больше `chunk_size`."""
+    if chunk_size < 1:
+        raise ValueError('Размер порции должен быть положительным')
+    iterator: Iterator[Package] = iter(packages)
+    while True:
+        chunk: List[Package] = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_stream(packages: Iterable[Package],
+               chunk_size: int = 1000,
+               fmt: str = 'text',
+               output: Optional[TextIO] = None,
+               cache: Optional[ResultCache] = None,
+               dead_letter: Optional[TextIO] = None
+               ) -> int:
+    """Обработать поток пакетов порциями и вернуть их количество.
+
+    В памяти одновременно находится не больше одной порции, поэтому
+    расход памяти не зависит от длины потока. Каждая порция выводится
+    одной записью в поток. С `cache` повторные пакеты не пересчитываются.
+    С `dead_letter` пакеты проверяются `validate_package`, а отклонённые
+    записываются туда с причиной и не прерывают обработку.
+    """
+    if dead_letter is not None:
+        from homework_validate import filter_valid
+    stream: TextIO = sys.stdout if output is None else output
+    stream.write(render_header(fmt))
+    processed: int = 0
+    for chunk in chunked(packages, chunk_size):
+        if dead_letter is not None:
+            chunk = filter_valid(chunk, dead_letter)
+        rendered: str = (render_chunk(chunk, fmt) if cache is None
+                         else render_messages(cache.read_infos(chunk), fmt))
+        if PROFILER is None:
+            stream.write(rendered)
+        else:
+            started: float = perf_counter()
+            stream.write(rendered)
+            PROFILER.observe('write', '', perf_counter() - started)
+        processed += len(chunk)
+    return processed
+
+
+def read_source(source: Optional[str], fmt: str,
+                dead_letter: Optional[TextIO] = None) -> Iterator[Package]:
+    """Читать пакеты из файла, stdin ('-') или демонстрационного набора."""
+    if source is None:
+        yield from [('SWM', [720, 1, 80, 25, 40]),
+                    ('RUN', [15000, 1, 75]),
+                    ('WLK', [9000, 1, 75, 180])]
+    elif fmt == 'binary':
+        from homework_wire import iter_wire_file, iter_wire_stream
+
+        if source == '-':
+            yield from iter_wire_stream(sys.stdin.buffer)
+        else:
+            yield from iter_wire_file(source)
+    elif source == '-':
+        yield from iter_packages(sys.stdin, fmt, dead_letter)
+    else:
+        with open(source, encoding='utf-8') as stream:
+            yield from iter_packages(stream, fmt, dead_letter)
+
+
+def read_infos(chunk: Iterable[Package]) -> List[InfoMessage]:
+    """Рассчитать сообщения о тренировках для порции пакетов."""
+    if PROFILER is not None:
+        from homework_profile import read_infos_profiled
+
+        return read_infos_profiled(PROFILER, chunk)
+    infos: List[InfoMessage] = []
+    for workout_type, data in chunk:
+        training: Optional[Training] = read_package(workout_type, data)
+        if training is None:
+            raise PackageError(f'Неизвестный код тренировки: {workout_type}')
+        infos.append(training.show_training_info())
+    return infos
+
+
+OUTPUT_FORMATS: Tuple[str, ...] = ('text', 'jsonl', 'csv')
+INFO_FIELDS: Tuple[str, ...] = ('training_type', 'duration', 'distance',
+                                'speed', 'calories')
+
+
+def render_header(fmt: str) -> str:
+    """Вернуть заголовок вывода для формата `fmt`."""
+    if fmt == 'csv':
+        return ','.join(INFO_FIELDS) + '\n'
+    return ''
+
+
+def render_messages(infos: Iterable[InfoMessage], fmt: str = 'text') -> str:
+    """Сформировать вывод для набора сообщений одной строкой.
+
+    Формат 'text' побайтно совпадает с `get_message()`, форматы 'jsonl'
+    и 'csv' содержат поля сообщения без округления.
+    """
+    if fmt == 'text':
+        if PROFILER is not None:
+            from homework_profile import get_message_profiled
+
+            return ''.join([f'{get_message_profiled(PROFILER, info)}\n'
+                            for info in infos])
+        return ''.join([f'{info.get_message()}\n' for info in infos])
+    if fmt == 'jsonl':
+        import json
+
+        return ''.join([f'{json.dumps(dict(zip(INFO_FIELDS, info.as_row())))}'
+                        f'\n' for info in infos])
+    if fmt == 'csv':
+        import csv
+
+        buffer: io.StringIO = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(
+            info.as_row() for info in infos
+        )
+        return buffer.getvalue()
+    raise ValueError(f'Неизвестный формат вывода: {fmt}')
+
+
+def write_messages(infos: Iterable[InfoMessage],
+                   stream: TextIO,
+                   fmt: str = 'text') -> None:
+    """Записать сообщения в поток одной операцией записи."""
+    stream.write(render_header(fmt) + render_messages(infos, fmt))
+
+
+def render_chunk(chunk: List[Package], fmt: str = 'text') -> str:
+    """Вернуть вывод для порции пакетов."""
+    return render_messages(read_infos(chunk), fmt)
+
+
+CLI_DEFAULTS: Dict[str, object] = {'format': 'json', 'chunk_size': 1000,
+                                   'output_format': 'text'}
+# Модули режимов и имена, которые `homework` загружает из них по запросу.
+EXTENSIONS: Dict[str, Tuple[str, ...]] = {
+    'homework_types': ('Package',),
+    'homework_variants': (
+        'DATACLASS_GENERATED', 'make_slotted', 'build_slotted',
+        'CachedMetricsMixin', 'make_cached', 'build_cached',
+        'SlottedInfoMessage', 'SlottedTraining', 'SlottedRunning',
+        'SlottedSportsWalking', 'SlottedSwimming', 'CachedRunning',
+        'CachedSportsWalking', 'CachedSwimming', 'WorkoutTable',
+    ),
+    'homework_validate': (
+        'POSITIVE_FIELDS', 'INTEGRAL_FIELDS', 'check_value',
+        'validate_package', 'validate_batch', 'write_dead_letter',
+        'iter_valid', 'filter_valid',
+    ),
+    'homework_wire': (
+        'encode_package', 'get_wire_format', 'iter_wire_records',
+        'iter_wire_stream', 'iter_wire_file', 'iter_wire_trainings',
+        'decode_wire_batch',
+    ),
+    'homework_aggregate': (
+        'IntervalSample', 'IntervalTracker', 'WorkoutTotals',
+        'RollingWindow', 'WorkoutAggregator',
+    ),
+    'homework_store': ('WorkoutStore',),
+    'homework_cache': ('ResultCache',),
+    'homework_profile': (
+        'Profiler', 'enable_profiling', 'disable_profiling', 'profile_info',
+        'read_infos_profiled', 'get_message_profiled',
+    ),
+    'homework_export': (
+        'COLUMNAR_MAGIC', 'COLUMNAR_BLOCK', 'COLUMNAR_COMPRESSIONS',
+        'ColumnarWriter', 'iter_columnar', 'export_columnar',
+    ),
+    'homework_parallel': ('ThroughputStats', 'run_parallel'),
+    'homework_shards': (
+        'SHARD_STATES', 'CLAIM_LEASE', 'CLAIM_POLL', 'split_shards',
+        'worker_id', 'run_worker', 'process_shard', 'run_coordinator',
+        'drive_shards', 'run_local_workers', 'requeue_shards',
+        'is_abandoned', 'read_failure',
+    ),
+    'homework_service': (
+        'handle_request', 'stop_reading', 'handle_connection',
+        'SHUTDOWN_TIMEOUT', 'serve', 'run_service',
+    ),
+    'homework_cli': ('parse_args', 'run_local', 'run_mode'),
+}
+EXTENSION_NAMES: Dict[str, str] = {
+    name: module for module, names in EXTENSIONS.items() for name in names
+}
@@ -0,0 +1,207 @@
+"""Потоковая выгрузка результатов в колоночный файл."""
+from __future__ import annotations
+
+import math
+import struct
+from array import array
+from typing import (BinaryIO, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from homework_core import (INFO_FIELDS, WORKOUT_ARITY, WORKOUT_FIELDS,
+                           WORKOUT_TYPES, PackageError, chunked, compute_batch)
+from homework_types import Package
+
+
+COLUMNAR_MAGIC: bytes = b'HWCOL1\n'
+COLUMNAR_BLOCK: struct.Struct = struct.Struct('<I')
+COLUMNAR_COMPRESSIONS: Tuple[str, ...] = ('zlib', 'none')
+
+
+class ColumnarWriter:
+    """Потоковая запись результатов в колоночный файл блоками.
+
+    Строка содержит поля `InfoMessage` без округления и исходные поля
+    тренировки; поля, которых нет у вида спорта, равны NaN. Строки
+    копятся в буферах `array('d')` и при заполнении `batch_size`
+    записываются блоком: длина заголовка, заголовок в JSON и сжатые
+    колонки. Тип тренировки хранится словарём: в колонке лежат номера
+    названий из заголовка блока. В памяти находится не больше одного
+    блока, поэтому размер выгрузки не ограничен. Признак конца файла
+    пишет только `close()`; при выходе из `with` по исключению он не
+    записывается, и `iter_columnar` сообщит об оборванной выгрузке.
+    """
+
+    def __init__(self, stream: BinaryIO, batch_size: int = 65_536,
+                 compression: str = 'zlib', level: int = 6) -> None:
+        if batch_size < 1:
+            raise ValueError('Размер блока должен быть положительным')
+        if compression not in COLUMNAR_COMPRESSIONS:
+            raise ValueError(f'Неизвестное сжатие: {compression}')
+        self.stream: BinaryIO = stream
+        self.batch_size: int = batch_size
+        self.compression: str = compression
+        self.level: int = level
+        self.columns: Tuple[str, ...] = INFO_FIELDS[1:] + tuple(
+            name for name in dict.fromkeys(
+                name for names in WORKOUT_FIELDS.values() for name in names
+            ) if name not in INFO_FIELDS
+        )
+        self.rows: int = 0
+        self._reset()
+        stream.write(COLUMNAR_MAGIC)
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *args: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.stream.flush()
+
+    def write_chunk(self, chunk: Sequence[Package]) -> None:
+        """Рассчитать порцию пакетов и добавить её в текущий блок."""
+        start: int = 0
+        while start < len(chunk):
+            part: Sequence[Package] = chunk[
+                start:start + self.batch_size - self.pending
+            ]
+            self._append(part)
+            start += len(part)
+            if self.pending == self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Записать накопленные строки блоком."""
+        import json
+        import zlib
+
+        if not self.pending:
+            return
+        buffers: List[Tuple[str, str, bytes]] = [
+            ('training_type', 'B', self.type_codes.tobytes())
+        ] + [(name, 'd', column.tobytes())
+             for name, column in self.buffers.items()]
+        if self.compression == 'zlib':
+            buffers = [(name, typecode, zlib.compress(data, self.level))
+                       for name, typecode, data in buffers]
+        header: bytes = json.dumps({
+            'rows': self.pending,
+            'compression': self.compression,
+            'dictionary': self.dictionary,
+            'columns': [[name, typecode, len(data)]
+                        for name, typecode, data in buffers],
+        }).encode()
+        self.stream.write(b''.join([COLUMNAR_BLOCK.pack(len(header)), header,
+                                    *(data for _, _, data in buffers)]))
+        self.rows += self.pending
+        self._reset()
+
+    def close(self) -> None:
+        """Записать последний блок и признак конца файла."""
+        self.flush()
+        self.stream.write(COLUMNAR_BLOCK.pack(0))
+        self.stream.flush()
+
+    def _append(self, chunk: Sequence[Package]) -> None:
+        """Рассчитать порцию и только затем дописать её в буферы.
+
+        Ошибка расчёта или преобразования значений не меняет буферы,
+        поэтому блок не получает строк без данных.
+        """
+        positions: Dict[str, List[int]] = {}
+        for position, (workout_type, data) in enumerate(chunk):
+            if workout_type not in WORKOUT_TYPES:
+                raise PackageError(
+                    f'Неизвестный код тренировки: {workout_type}'
+                )
+            if len(data) != WORKOUT_ARITY[workout_type]:
+                raise PackageError(
+                    f'Для {workout_type} нужно '
+                    f'{WORKOUT_ARITY[workout_type]} значений, '
+                    f'получено {len(data)}'
+                )
+            positions.setdefault(workout_type, []).append(position)
+        block: Dict[str, array] = {
+            name: array('d', [math.nan]) * len(chunk) for name in self.buffers
+        }
+        training_types: List[str] = [''] * len(chunk)
+        for workout_type, rows in positions.items():
+            names: Tuple[str, ...] = WORKOUT_FIELDS[workout_type]
+            inputs: Dict[str, List[float]] = {
+                name: [chunk[row][1][column] for row in rows]
+                for column, name in enumerate(names)
+            }
+            values: Dict[str, Sequence[float]] = dict(
+                inputs, **compute_batch(workout_type, inputs)
+            )
+            for row in rows:
+                training_types[row] = WORKOUT_TYPES[workout_type].__name__
+            for name, column_values in values.items():
+                column: array = block[name]
+                for row, value in zip(rows, column_values):
+                    column[row] = value
+        self.type_codes.extend(self._type_code(training_type)
+                               for training_type in training_types)
+        for name, column in self.buffers.items():
+            column.extend(block[name])
+        self.pending += len(chunk)
+
+    def _type_code(self, training_type: str) -> int:
+        try:
+            return self.dictionary.index(training_type)
+        except ValueError:
+            self.dictionary.append(training_type)
+            return len(self.dictionary) - 1
+
+    def _reset(self) -> None:
+        self.pending: int = 0
+        self.dictionary: List[str] = []
+        self.type_codes: array = array('B')
+        self.buffers: Dict[str, array] = {name: array('d')
+                                          for name in self.columns}
+
+
+def iter_columnar(stream: BinaryIO) -> Iterator[Dict[str, object]]:
+    """Читать колоночный файл блоками.
+
+    Каждый блок возвращается словарём колонок: 'training_type' — список
+    названий, остальные колонки — `array('d')`, которые numpy и pandas
+    читают без копирования (`numpy.frombuffer`).
+    """
+    import json
+    import zlib
+
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError('Файл не является колоночной выгрузкой')
+    while True:
+        prefix: bytes = stream.read(COLUMNAR_BLOCK.size)
+        if len(prefix) < COLUMNAR_BLOCK.size:
+            raise ValueError('Выгрузка оборвана: нет признака конца файла')
+        length: int = COLUMNAR_BLOCK.unpack(prefix)[0]
+        if not length:
+            return
+        header: Dict[str, object] = json.loads(stream.read(length))
+        batch: Dict[str, object] = {}
+        for name, typecode, size in header['columns']:
+            data: bytes = stream.read(size)
+            if header['compression'] == 'zlib':
+                data = zlib.decompress(data)
+            batch[name] = array(typecode, data)
+        batch['training_type'] = [header['dictionary'][code]
+                                  for code in batch['training_type']]
+        yield batch
+
+
+def export_columnar(packages: Iterable[Package], path: str,
+                    batch_size: int = 65_536,
+                    compression: str = 'zlib') -> int:
+    """Выгрузить результаты пакетов в колоночный файл `path`.
+
+    Возвращает число записанных строк.
+    """
+    with open(path, 'wb') as stream, ColumnarWriter(
+            stream, batch_size, compression) as writer:
+        for chunk in chunked(packages, batch_size):
+            writer.write_chunk(chunk)
+    return writer.rows
@@ -0,0 +1,97 @@
+"""Обработка пакетов порциями в пуле процессов."""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Iterable, Optional, Set, TextIO
+
+from homework_core import chunked, render_chunk, render_header
+from homework_types import Package
+from homework_validate import filter_valid
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+@dataclass
+class ThroughputStats:
+    """Статистика параллельной обработки пакетов."""
+
+    packages: int
+    chunks: int
+    workers: int
+    seconds: float
+
+    @property
+    def packages_per_second(self) -> float:
+        """Пропускная способность в пакетах в секунду."""
+        if not self.seconds:
+            return 0.0
+        return self.packages / self.seconds
+
+    def get_message(self) -> str:
+        """Вернуть строку со статистикой."""
+        return (f'Пакетов: {self.packages}; порций: {self.chunks};'
+                f' процессов: {self.workers};'
+                f' время: {self.seconds:.3f} с;'
+                f' пакетов в секунду: {self.packages_per_second:.1f}.')
+
+
+def run_parallel(packages: Iterable[Package],
+                 chunk_size: int = 1000,
+                 workers: Optional[int] = None,
+                 ordered: bool = True,
+                 output: Optional[TextIO] = None,
+                 fmt: str = 'text',
+                 dead_letter: Optional[TextIO] = None
+                 ) -> ThroughputStats:
+    """Обработать пакеты порциями в пуле процессов.
+
+    В работе одновременно не больше двух порций на процесс, поэтому
+    поток пакетов читается по мере обработки. При `ordered=False`
+    сообщения печатаются в порядке готовности порций. С `dead_letter`
+    пакеты проверяются до отправки в пул, как в `run_stream`.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    stream: TextIO = sys.stdout if output is None else output
+    stream.write(render_header(fmt))
+    started: float = time.perf_counter()
+    processed: int = 0
+    chunks: int = 0
+    pool_size: int = workers or os.cpu_count() or 1
+    max_in_flight: int = pool_size * 2
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunked(packages, chunk_size):
+            if dead_letter is not None:
+                chunk = filter_valid(chunk, dead_letter)
+            pending.append(executor.submit(render_chunk, chunk, fmt))
+            chunks += 1
+            processed += len(chunk)
+            while len(pending) >= max_in_flight:
+                pending = _drain(pending, ordered, stream)
+        while pending:
+            pending = _drain(pending, ordered, stream)
+    return ThroughputStats(packages=processed,
+                           chunks=chunks,
+                           workers=pool_size,
+                           seconds=time.perf_counter() - started)
+
+
+def _drain(pending: Deque[Future], ordered: bool,
+           stream: TextIO) -> Deque[Future]:
+    """Напечатать результаты готовых порций и вернуть оставшиеся."""
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    if ordered:
+        stream.write(pending.popleft().result())
+        return pending
+    done: Set[Future]
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        stream.write(future.result())
+    return deque(future for future in pending if future not in done)
@@ -0,0 +1,142 @@
+"""Замер времени этапов расчёта.
+
+Профилировщик хранится в `homework_core.PROFILER`; расчёт проверяет эту
+переменную и загружает модуль только при включённом профилировании.
+"""
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import homework_core
+from homework_core import InfoMessage, PackageError, Training, read_package
+from homework_types import Package
+
+
+class Profiler:
+    """Счётчики и гистограммы задержек по этапам расчёта.
+
+    Этапы: 'dispatch' (`read_package`), 'metrics' (`get_distance` и
+    `get_mean_speed`), 'calories' (`get_spent_calories`), 'info'
+    (создание `InfoMessage` из готовых значений), 'message'
+    (`get_message`) и 'write' (запись порции в поток). Метки - этап и
+    вид спорта; для 'write' вид спорта не указывается.
+    """
+
+    BUCKETS: Tuple[float, ...] = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+                                  1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+    def __init__(self) -> None:
+        self.histograms: Dict[Tuple[str, str], List[int]] = {}
+        self.sums: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, stage: str, training_type: str,
+                seconds: float) -> None:
+        """Учесть одно измерение этапа."""
+        key: Tuple[str, str] = (stage, training_type)
+        histogram: Optional[List[int]] = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [0] * (len(self.BUCKETS) + 1)
+            self.sums[key] = 0.0
+        histogram[bisect_left(self.BUCKETS, seconds)] += 1
+        self.sums[key] += seconds
+
+    def count(self, stage: str, training_type: str = '') -> int:
+        """Число измерений этапа."""
+        return sum(self.histograms.get((stage, training_type), ()))
+
+    def export_prometheus(self) -> str:
+        """Вернуть метрики в текстовом формате Prometheus."""
+        lines: List[str] = [
+            '# HELP homework_stage_seconds Время этапа расчёта тренировки.',
+            '# TYPE homework_stage_seconds histogram',
+        ]
+        for (stage, training_type), histogram in sorted(
+                self.histograms.items()):
+            labels: str = f'stage="{stage}",training_type="{training_type}"'
+            cumulative: int = 0
+            for bound, hits in zip(self.BUCKETS + (float('inf'),),
+                                   histogram):
+                cumulative += hits
+                upper: str = '+Inf' if bound == float('inf') else f'{bound}'
+                lines.append(f'homework_stage_seconds_bucket'
+                             f'{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f'homework_stage_seconds_sum{{{labels}}} '
+                         f'{self.sums[(stage, training_type)]}')
+            lines.append(f'homework_stage_seconds_count{{{labels}}} '
+                         f'{cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str) -> None:
+        """Записать метрики в файл или в stderr ('-')."""
+        if path == '-':
+            sys.stderr.write(self.export_prometheus())
+            return
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(self.export_prometheus())
+
+
+def enable_profiling(dump_path: Optional[str] = None) -> Profiler:
+    """Включить сбор метрик; `dump_path` - куда записать их при выходе.
+
+    Пока сбор выключен, расчёт проверяет только одну глобальную
+    переменную `homework_core.PROFILER` на порцию пакетов. Метрики
+    собираются в текущем процессе, рабочие процессы `run_parallel` не
+    учитываются.
+    """
+    import atexit
+
+    profiler: Profiler = Profiler()
+    homework_core.PROFILER = profiler
+    if dump_path is not None:
+        atexit.register(profiler.dump, dump_path)
+    return profiler
+
+
+def disable_profiling() -> None:
+    """Выключить сбор метрик."""
+    homework_core.PROFILER = None
+
+
+def profile_info(profiler: Profiler, training: Training) -> InfoMessage:
+    """Рассчитать сообщение о тренировке с замером этапов."""
+    training_type: str = type(training).__name__
+    started: float = perf_counter()
+    distance: float = training.get_distance()
+    speed: float = training.get_mean_speed()
+    measured: float = perf_counter()
+    calories: float = training.get_spent_calories()
+    calculated: float = perf_counter()
+    info: InfoMessage = training.INFO_MESSAGE(
+        training_type=training_type, duration=training.duration,
+        distance=distance, speed=speed, calories=calories
+    )
+    profiler.observe('metrics', training_type, measured - started)
+    profiler.observe('calories', training_type, calculated - measured)
+    profiler.observe('info', training_type, perf_counter() - calculated)
+    return info
+
+
+def read_infos_profiled(profiler: Profiler,
+                        chunk: Iterable[Package]) -> List[InfoMessage]:
+    """Вариант `read_infos` с замером этапов."""
+    infos: List[InfoMessage] = []
+    for workout_type, data in chunk:
+        started: float = perf_counter()
+        training: Optional[Training] = read_package(workout_type, data)
+        if training is None:
+            raise PackageError(f'Неизвестный код тренировки: {workout_type}')
+        profiler.observe('dispatch', type(training).__name__,
+                         perf_counter() - started)
+        infos.append(profile_info(profiler, training))
+    return infos
+
+
+def get_message_profiled(profiler: Profiler, info: InfoMessage) -> str:
+    """Вернуть строку сообщения с замером времени форматирования."""
+    started: float = perf_counter()
+    message: str = info.get_message()
+    profiler.observe('message', info.training_type, perf_counter() - started)
+    return message
@@ -0,0 +1,150 @@
+"""Сервис расчёта тренировок на TCP или Unix-сокете."""
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, List, Optional, Set
+
+from homework_core import (InfoMessage, parse_json_package, read_infos,
+                           render_messages)
+
+if TYPE_CHECKING:
+    import argparse
+    import asyncio
+
+
+def handle_request(line: bytes, fmt: str = 'jsonl') -> bytes:
+    """Обработать одну строку запроса сервиса и вернуть строку ответа.
+
+    Ответ формируется в формате вывода `fmt`; ошибка всегда
+    возвращается JSON-объектом с ключом 'error'.
+    """
+    import json
+
+    try:
+        infos: List[InfoMessage] = read_infos([parse_json_package(line)])
+    except Exception as error:
+        return (json.dumps({'error': f'{type(error).__name__}: {error}'})
+                + '\n').encode()
+    return render_messages(infos, fmt).encode()
+
+
+def stop_reading(reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+    """Перестать принимать данные соединения.
+
+    Уже полученные строки остаются в `reader`, после них `readline()`
+    вернёт пустую строку, как при закрытии соединения клиентом.
+    """
+    if not writer.transport.is_closing():
+        writer.transport.pause_reading()
+    reader.feed_eof()
+
+
+async def handle_connection(reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter,
+                            fmt: str = 'jsonl',
+                            stop: Optional[asyncio.Event] = None) -> None:
+    """Отвечать на запросы соединения в порядке их поступления.
+
+    Клиент может отправлять запросы, не дожидаясь ответов: они
+    буферизуются в `reader`, а `drain()` притормаживает чтение, пока
+    клиент не заберёт ответы. После установки `stop` соединение
+    перестаёт читать новые данные, отвечает на уже полученные запросы
+    и закрывается, в том числе если клиент простаивал.
+    """
+    import asyncio
+
+    def on_stop(task: asyncio.Task) -> None:
+        if not task.cancelled():
+            stop_reading(reader, writer)
+
+    watcher: Optional[asyncio.Task] = None
+    if stop is not None:
+        watcher = asyncio.ensure_future(stop.wait())
+        watcher.add_done_callback(on_stop)
+    try:
+        while True:
+            line: bytes = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            writer.write(handle_request(line, fmt))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        writer.close()
+
+
+SHUTDOWN_TIMEOUT: float = 5.0
+
+
+async def serve(host: str = '127.0.0.1',
+                port: int = 8765,
+                path: Optional[str] = None,
+                max_concurrency: int = 100,
+                stop: Optional[asyncio.Event] = None,
+                started: Optional[asyncio.Event] = None,
+                fmt: str = 'jsonl') -> None:
+    """Запустить сервис расчёта тренировок на TCP или Unix-сокете.
+
+    Одновременно обслуживается не больше `max_concurrency` соединений,
+    остальные ждут своей очереди. Сервис работает до установки события
+    `stop` или до сигнала SIGINT/SIGTERM, после чего перестаёт принимать
+    соединения, отвечает на уже полученные запросы и закрывает открытые
+    соединения. Обработчики, не завершившиеся за `SHUTDOWN_TIMEOUT`
+    секунд, отменяются.
+    """
+    import asyncio
+    import signal
+
+    stop = asyncio.Event() if stop is None else stop
+    limit: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+    connections: Set[asyncio.Task] = set()
+
+    async def on_connect(reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        task: asyncio.Task = asyncio.current_task()
+        connections.add(task)
+        try:
+            async with limit:
+                await handle_connection(reader, writer, fmt, stop)
+        finally:
+            connections.discard(task)
+
+    if path is None:
+        server = await asyncio.start_server(on_connect, host, port)
+    else:
+        server = await asyncio.start_unix_server(on_connect, path)
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    if started is not None:
+        started.set()
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        if connections:
+            _, pending = await asyncio.wait(connections,
+                                            timeout=SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+
+
+def run_service(args: argparse.Namespace) -> None:
+    """Запустить сервис с параметрами командной строки."""
+    import asyncio
+
+    asyncio.run(serve(args.host, args.port, args.unix, args.max_concurrency,
+                      fmt=args.output_format or 'jsonl'))
@@ -0,0 +1,253 @@
+"""Обработка пакетов шардами через общий каталог."""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from homework_core import (PackageError, chunked, iter_packages, render_chunk,
+                           render_header)
+from homework_parallel import ThroughputStats
+from homework_types import Package
+from homework_validate import iter_valid
+
+
+SHARD_STATES: Tuple[str, ...] = ('todo', 'claimed', 'done', 'failed')
+CLAIM_LEASE: float = 60.0
+CLAIM_POLL: float = 1.0
+
+
+def split_shards(packages: Iterable[Package], work_dir: str,
+                 shard_size: int) -> int:
+    """Разложить пакеты по файлам-шардам в `work_dir/todo`."""
+    import json
+
+    for state in SHARD_STATES:
+        directory: str = os.path.join(work_dir, state)
+        os.makedirs(directory, exist_ok=True)
+        if os.listdir(directory):
+            raise ValueError(f'Каталог {directory} должен быть пустым')
+    shards: int = 0
+    for shard in chunked(packages, shard_size):
+        path: str = os.path.join(work_dir, 'todo', f'{shards:08d}.jsonl')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as stream:
+            stream.writelines(f'{json.dumps(package)}\n'
+                              for package in shard)
+        os.replace(f'{path}.tmp', path)
+        shards += 1
+    return shards
+
+
+def worker_id(pid: Optional[int] = None) -> str:
+    """Имя рабочего процесса в именах захваченных шардов."""
+    import socket
+
+    return f'{socket.gethostname()}-{os.getpid() if pid is None else pid}'
+
+
+def run_worker(work_dir: str, fmt: str = 'text',
+               chunk_size: int = 1000) -> int:
+    """Обрабатывать шарды из общего каталога, пока они не кончатся.
+
+    Шард захватывается атомарным переименованием из `todo` в `claimed`,
+    поэтому рабочие на разных машинах с общим каталогом не мешают друг
+    другу. После каждой порции рабочий обновляет время изменения файла
+    захвата: захват без обновлений дольше `CLAIM_LEASE` координатор
+    считает брошенным. Если захват отобран, шард оставляется другому
+    рабочему. Результат пишется в `done`, ошибка - в `failed`.
+    Возвращает число обработанных шардов.
+    """
+    worker: str = worker_id()
+    processed: int = 0
+    while True:
+        names: List[str] = sorted(
+            name for name in os.listdir(os.path.join(work_dir, 'todo'))
+            if name.endswith('.jsonl')
+        )
+        if not names:
+            return processed
+        for name in names:
+            claimed: str = os.path.join(work_dir, 'claimed',
+                                        f'{name}.{worker}')
+            try:
+                os.rename(os.path.join(work_dir, 'todo', name), claimed)
+                os.utime(claimed)
+            except FileNotFoundError:
+                continue
+            processed += process_shard(work_dir, name, claimed, worker,
+                                       fmt, chunk_size)
+
+
+def process_shard(work_dir: str, name: str, claimed: str, worker: str,
+                  fmt: str, chunk_size: int) -> int:
+    """Обработать захваченный шард; вернуть 1, если результат записан.
+
+    Шард, захват которого отобран координатором, не записывается ни в
+    `done`, ни в `failed`.
+    """
+    result: str = os.path.join(work_dir, 'done',
+                               name.replace('.jsonl', '.out'))
+    partial: str = f'{result}.{worker}.tmp'
+    try:
+        with open(claimed, encoding='utf-8') as source, \
+                open(partial, 'w', encoding='utf-8') as output:
+            for chunk in chunked(iter_packages(source), chunk_size):
+                output.write(render_chunk(chunk, fmt))
+                os.utime(claimed)
+    except Exception as error:
+        if os.path.exists(partial):
+            os.remove(partial)
+        if not os.path.exists(claimed):
+            return 0
+        with open(os.path.join(work_dir, 'failed', name), 'w',
+                  encoding='utf-8') as failure:
+            failure.write(f'{worker}: {type(error).__name__}: {error}\n')
+        try:
+            os.replace(claimed, os.path.join(work_dir, 'failed',
+                                             f'{name}.shard'))
+        except FileNotFoundError:
+            pass
+        return 0
+    os.replace(partial, result)
+    try:
+        os.remove(claimed)
+    except FileNotFoundError:
+        pass
+    return 1
+
+
+def run_coordinator(packages: Iterable[Package],
+                    work_dir: str,
+                    workers: int = 2,
+                    shard_size: int = 10_000,
+                    retries: int = 2,
+                    fmt: str = 'text',
+                    output: Optional[TextIO] = None,
+                    chunk_size: int = 1000,
+                    dead_letter: Optional[TextIO] = None,
+                    lease: float = CLAIM_LEASE) -> ThroughputStats:
+    """Обработать пакеты шардами в локальных рабочих процессах.
+
+    Координатор раскладывает пакеты по шардам в `work_dir`, запускает
+    `workers` процессов `run_worker` и ждёт, пока не будут обработаны
+    все шарды. Шарды с ошибкой, шарды завершившихся локальных процессов
+    и захваты без обновлений дольше `lease` секунд возвращаются в
+    очередь до `retries` раз. Результаты склеиваются в порядке шардов.
+    С `dead_letter` пакеты проверяются до раскладки по шардам, как в
+    `run_parallel`, и некорректный пакет не губит весь шард.
+    Дополнительные рабочие на других машинах подключаются командой
+    `python -m homework --worker WORK_DIR` к тому же каталогу; пока их
+    захваты обновляются, координатор ждёт результатов.
+    """
+    stream: TextIO = sys.stdout if output is None else output
+    started: float = time.perf_counter()
+    if dead_letter is not None:
+        packages = iter_valid(packages, dead_letter, chunk_size)
+    shards: int = split_shards(packages, work_dir, shard_size)
+    drive_shards(work_dir, workers, retries, fmt, chunk_size, lease)
+    stream.write(render_header(fmt))
+    processed: int = 0
+    for index in range(shards):
+        with open(os.path.join(work_dir, 'done', f'{index:08d}.out'),
+                  encoding='utf-8') as result:
+            for block in iter(lambda: result.read(1 << 16), ''):
+                stream.write(block)
+                processed += block.count('\n')
+    return ThroughputStats(packages=processed,
+                           chunks=shards,
+                           workers=workers,
+                           seconds=time.perf_counter() - started)
+
+
+def drive_shards(work_dir: str, workers: int, retries: int, fmt: str,
+                 chunk_size: int, lease: float) -> None:
+    """Запускать локальных рабочих, пока в `claimed` остаются шарды."""
+    attempts: Dict[str, int] = {}
+    while True:
+        finished: Set[str] = run_local_workers(work_dir, workers, fmt,
+                                               chunk_size)
+        while not requeue_shards(work_dir, attempts, retries, finished,
+                                 lease):
+            if not os.listdir(os.path.join(work_dir, 'claimed')):
+                return
+            time.sleep(min(lease / 4, CLAIM_POLL))
+
+
+def run_local_workers(work_dir: str, workers: int, fmt: str,
+                      chunk_size: int) -> Set[str]:
+    """Запустить `workers` процессов `run_worker` и дождаться их.
+
+    Возвращает имена завершившихся рабочих для `requeue_shards`.
+    """
+    import multiprocessing
+
+    processes: List[multiprocessing.Process] = [
+        multiprocessing.Process(target=run_worker,
+                                args=(work_dir, fmt, chunk_size))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return {worker_id(process.pid) for process in processes}
+
+
+def requeue_shards(work_dir: str, attempts: Dict[str, int],
+                   retries: int, finished: Iterable[str] = (),
+                   lease: float = CLAIM_LEASE) -> int:
+    """Вернуть в очередь шарды с ошибкой и брошенные шарды.
+
+    Захват считается брошенным, если его рабочий есть в `finished` или
+    файл захвата не обновлялся дольше `lease` секунд; живые захваты не
+    трогаются и не считаются повторами. Возвращает число возвращённых
+    шардов. Если шард исчерпал `retries` повторов, выбрасывает
+    `PackageError` с последней ошибкой.
+    """
+    finished = set(finished)
+    requeued: int = 0
+    for state in ('failed', 'claimed'):
+        directory: str = os.path.join(work_dir, state)
+        for name in os.listdir(directory):
+            path: str = os.path.join(directory, name)
+            if state == 'failed' and not name.endswith('.shard'):
+                continue
+            shard, _, worker = name.partition('.jsonl')
+            shard += '.jsonl'
+            if state == 'claimed' and not is_abandoned(
+                    path, worker[1:], finished, lease):
+                continue
+            attempts[shard] = attempts.get(shard, 0) + 1
+            if attempts[shard] > retries:
+                raise PackageError(
+                    f'Шард {shard} не обработан после {retries} '
+                    f'повторов: {read_failure(work_dir, shard)}'
+                )
+            try:
+                os.replace(path, os.path.join(work_dir, 'todo', shard))
+            except FileNotFoundError:
+                attempts[shard] -= 1
+                continue
+            requeued += 1
+    return requeued
+
+
+def is_abandoned(path: str, worker: str, finished: Set[str],
+                 lease: float) -> bool:
+    """Проверить, брошен ли захват шарда рабочим `worker`."""
+    if worker in finished:
+        return True
+    try:
+        return time.time() - os.stat(path).st_mtime > lease
+    except FileNotFoundError:
+        return False
+
+
+def read_failure(work_dir: str, shard: str) -> str:
+    """Вернуть последнюю записанную ошибку шарда."""
+    path: str = os.path.join(work_dir, 'failed', shard)
+    if not os.path.exists(path):
+        return 'рабочий процесс завершился, не обработав шард'
+    with open(path, encoding='utf-8') as failure:
+        return failure.read().strip()
@@ -0,0 +1,229 @@
+"""Колоночное хранилище рассчитанных тренировок на диске."""
+from __future__ import annotations
+
+import math
+import os
+from array import array
+from bisect import bisect_left
+from dataclasses import fields
+from typing import (TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from homework_aggregate import WorkoutTotals
+from homework_core import (WIRE_FORMATS, WIRE_TAGS, WORKOUT_TYPES, InfoMessage,
+                           PackageError, Training, chunked, read_package)
+
+if TYPE_CHECKING:
+    import mmap
+
+
+class WorkoutStore:
+    """Колоночное хранилище тренировок на диске с чтением через `mmap`.
+
+    Каждая колонка лежит в отдельном файле `<имя>.col` и только
+    дописывается. Каждый `flush()` добавляет отсортированный отрезок
+    индекса `index.<первая строка>.col` с номерами новых строк,
+    упорядоченными по спортсмену и времени, поэтому запись не
+    перечитывает уже сохранённые строки. Выборка диапазона ищет его
+    в каждом отрезке двоичным поиском и сливает результаты; `compact()`
+    объединяет отрезки в один. Добавленные строки видны запросам после
+    `flush()`.
+    """
+
+    RESULT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+        ('timestamp', 'q'), ('athlete', 'q'), ('workout_tag', 'B'),
+        ('distance', 'd'), ('speed', 'd'), ('calories', 'd'),
+    )
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path: str = path
+        self.typecodes: Dict[str, str] = dict(self.RESULT_COLUMNS)
+        self.typecodes['action'] = 'q'
+        for training_type in WORKOUT_TYPES.values():
+            for field in fields(training_type)[1:]:
+                self.typecodes.setdefault(field.name, 'd')
+        self.pending: Dict[str, array] = {
+            name: array(typecode) for name, typecode in self.typecodes.items()
+        }
+        self.maps: Dict[str, mmap.mmap] = {}
+        self.columns: Dict[str, memoryview] = {}
+        self.index_runs: List[memoryview] = []
+        self.rows: int = 0
+        self._open_columns()
+
+    def __enter__(self) -> 'WorkoutStore':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def append(self, athlete: int, timestamp: int,
+               workout_type: str, data: Sequence[float]) -> None:
+        """Рассчитать тренировку и добавить её в буфер записи.
+
+        Строка целиком проверяется и приводится к типам колонок до
+        записи, поэтому отклонённый пакет не оставляет в буфере колонки
+        разной длины. Целочисленные поля принимают float без дробной
+        части (например, 15000.0 из CSV).
+        """
+        training: Optional[Training] = read_package(workout_type, data)
+        if training is None or workout_type not in WIRE_TAGS:
+            raise PackageError(f'Неизвестный код тренировки: {workout_type}')
+        info: InfoMessage = training.show_training_info()
+        values: Dict[str, float] = {
+            field.name: getattr(training, field.name)
+            for field in fields(training)
+        }
+        values.update(timestamp=timestamp, athlete=athlete,
+                      workout_tag=WIRE_TAGS[workout_type],
+                      distance=info.distance, speed=info.speed,
+                      calories=info.calories)
+        row: Dict[str, array] = {}
+        for name, typecode in self.typecodes.items():
+            value: float = values.get(name, math.nan)
+            if typecode == 'q' and isinstance(value, float):
+                if not value.is_integer():
+                    raise PackageError(f'{name}: ожидается целое число, '
+                                       f'получено {value}')
+                value = int(value)
+            try:
+                row[name] = array(typecode, [value])
+            except (TypeError, OverflowError) as error:
+                raise PackageError(f'{name}: {error}') from error
+        for name, column in self.pending.items():
+            column.extend(row[name])
+
+    def flush(self) -> None:
+        """Дописать буфер в файлы колонок и добавить отрезок индекса."""
+        added: int = len(self.pending['timestamp'])
+        if not added:
+            return
+        for name, column in self.pending.items():
+            with open(self._column_path(name), 'ab') as stream:
+                column.tofile(stream)
+        run: array = array('q', sorted(
+            range(self.rows, self.rows + added),
+            key=lambda row: (self.pending['athlete'][row - self.rows],
+                             self.pending['timestamp'][row - self.rows])
+        ))
+        self._write_index(f'index.{self.rows:012d}', [run])
+        self.pending = {name: array(typecode)
+                        for name, typecode in self.typecodes.items()}
+        self._close_columns()
+        self._open_columns()
+
+    def compact(self) -> None:
+        """Объединить отрезки индекса в один.
+
+        Слияние читает весь индекс, поэтому его стоит запускать
+        отдельно от записи, когда отрезков накопилось много.
+        """
+        import heapq
+
+        self.flush()
+        if len(self.index_runs) < 2:
+            return
+        old_runs: List[str] = self._index_names()
+        merged: Iterator[int] = heapq.merge(*self.index_runs,
+                                            key=self._sort_key)
+        self._write_index('index.000000000000',
+                          (array('q', part)
+                           for part in chunked(merged, 1 << 16)))
+        self._close_columns()
+        for name in old_runs:
+            if name != 'index.000000000000':
+                os.unlink(self._column_path(name))
+        self._open_columns()
+
+    def close(self) -> None:
+        """Сохранить буфер и закрыть отображения файлов."""
+        self.flush()
+        self._close_columns()
+
+    def scan(self, athlete: int, start: int, end: int) -> Iterator[int]:
+        """Номера строк спортсмена с `start <= timestamp < end`."""
+        import heapq
+
+        if len(self.index_runs) == 1:
+            return self._scan_run(self.index_runs[0], athlete, start, end)
+        return heapq.merge(*(self._scan_run(run, athlete, start, end)
+                             for run in self.index_runs),
+                           key=self._sort_key)
+
+    def record(self, row: int) -> Dict[str, object]:
+        """Вернуть строку хранилища как словарь."""
+        values: Dict[str, object] = {
+            name: self.columns[name][row] for name in self.typecodes
+        }
+        workout_type: str = WIRE_FORMATS[values.pop('workout_tag')][0]
+        values['training_type'] = WORKOUT_TYPES[workout_type].__name__
+        return values
+
+    def aggregate(self, athlete: int, start: int, end: int) -> WorkoutTotals:
+        """Итоги спортсмена за интервал времени."""
+        totals: WorkoutTotals = WorkoutTotals()
+        columns: Dict[str, memoryview] = self.columns
+        for row in self.scan(athlete, start, end):
+            totals.add(WorkoutTotals(1, columns['duration'][row],
+                                     columns['distance'][row],
+                                     columns['calories'][row]))
+        return totals
+
+    def _scan_run(self, run: memoryview, athlete: int,
+                  start: int, end: int) -> Iterator[int]:
+        position: int = bisect_left(run, (athlete, start),
+                                    key=self._sort_key)
+        while position < len(run):
+            row: int = run[position]
+            if self._sort_key(row) >= (athlete, end):
+                return
+            yield row
+            position += 1
+
+    def _sort_key(self, row: int) -> Tuple[int, int]:
+        return self.columns['athlete'][row], self.columns['timestamp'][row]
+
+    def _write_index(self, name: str, parts: Iterable[array]) -> None:
+        path: str = self._column_path(name)
+        with open(f'{path}.tmp', 'wb') as stream:
+            for part in parts:
+                part.tofile(stream)
+        os.replace(f'{path}.tmp', path)
+
+    def _index_names(self) -> List[str]:
+        return sorted(name[:-len('.col')] for name in os.listdir(self.path)
+                      if name.startswith('index') and name.endswith('.col'))
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.col')
+
+    def _open_columns(self) -> None:
+        import mmap
+
+        names: Dict[str, str] = dict(self.typecodes)
+        names.update(dict.fromkeys(self._index_names(), 'q'))
+        for name, typecode in names.items():
+            path: str = self._column_path(name)
+            if not os.path.exists(path) or not os.path.getsize(path):
+                continue
+            with open(path, 'rb') as stream:
+                self.maps[name] = mmap.mmap(stream.fileno(), 0,
+                                            access=mmap.ACCESS_READ)
+            self.columns[name] = memoryview(self.maps[name]).cast(typecode)
+            if name not in self.typecodes:
+                self.index_runs.append(self.columns[name])
+        timestamps: Optional[memoryview] = self.columns.get('timestamp')
+        self.rows = 0 if timestamps is None else len(timestamps)
+
+    def _close_columns(self) -> None:
+        for view in self.columns.values():
+            view.release()
+        for mapped in self.maps.values():
+            mapped.close()
+        self.columns = {}
+        self.maps = {}
+        self.index_runs = []
@@ -0,0 +1,8 @@
+"""Типы для аннотаций кода расчёта тренировок.
+
+Вынесены из `homework_core`, чтобы короткий запуск не импортировал
+`typing`.
+"""
+from typing import List, Tuple
+
+Package = Tuple[str, List[float]]
@@ -0,0 +1,140 @@
+"""Проверка пакетов датчиков и запись отклонённых пакетов.
+
+Используется режимами с `--dead-letter` и загружается при первом
+обращении к этим функциям.
+"""
+from __future__ import annotations
+
+import math
+from numbers import Integral, Real
+from typing import (Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+                    TextIO, Tuple)
+
+from homework_core import WORKOUT_FIELDS, chunked
+from homework_types import Package
+
+
+POSITIVE_FIELDS: Set[str] = {'duration', 'weight', 'height', 'length_pool'}
+INTEGRAL_FIELDS: Set[str] = {'action'}
+
+
+def check_value(name: str, value: object) -> Optional[str]:
+    """Вернуть причину, по которой значение поля недопустимо."""
+    if isinstance(value, bool) or not isinstance(value, Real):
+        return f'{name}: ожидается число, получено {type(value).__name__}'
+    if name in INTEGRAL_FIELDS and not isinstance(value, Integral):
+        return f'{name}: ожидается целое число, получено {value!r}'
+    if not math.isfinite(value):
+        return f'{name}: значение {value} не конечно'
+    if name in POSITIVE_FIELDS:
+        if value <= 0:
+            return f'{name}: значение {value} должно быть больше нуля'
+    elif value < 0:
+        return f'{name}: значение {value} не может быть отрицательным'
+    return None
+
+
+def validate_package(workout_type: object, data: object) -> Optional[str]:
+    """Проверить пакет датчиков до расчёта.
+
+    Возвращает None для корректного пакета или причину отказа: неизвестный
+    код, неверное число значений, нечисловые, бесконечные или
+    выходящие за допустимый диапазон значения.
+    """
+    if not isinstance(workout_type, str):
+        return (f'Код тренировки должен быть строкой, получено '
+                f'{type(workout_type).__name__}')
+    names: Optional[Tuple[str, ...]] = WORKOUT_FIELDS.get(workout_type)
+    if names is None:
+        return f'Неизвестный код тренировки: {workout_type}'
+    if not isinstance(data, (list, tuple)):
+        return f'Данные должны быть списком, получено {type(data).__name__}'
+    if len(data) != len(names):
+        return (f'Для {workout_type} нужно {len(names)} значений, '
+                f'получено {len(data)}')
+    for name, value in zip(names, data):
+        reason: Optional[str] = check_value(name, value)
+        if reason is not None:
+            return reason
+    return None
+
+
+def _bad_rows(name: str, column: Sequence[float]) -> List[int]:
+    """Номера недопустимых значений колонки поля `name`."""
+    if name not in INTEGRAL_FIELDS:
+        try:
+            return [index for index, value in enumerate(column)
+                    if not (0 <= value < math.inf
+                            and (value > 0 or name not in POSITIVE_FIELDS))
+                    or type(value) is bool]
+        except TypeError:
+            pass
+    return [index for index, value in enumerate(column)
+            if check_value(name, value) is not None]
+
+
+def validate_batch(workout_type: str,
+                   arrays: Dict[str, Sequence[float]]
+                   ) -> List[Tuple[int, str]]:
+    """Проверить колонки пакетов перед `compute_batch`.
+
+    Проверка идёт по колонкам, а не по пакетам, но внутри колонки
+    значения перебираются в Python по одному: это не векторный расчёт.
+    Возвращаются номера строк с причинами отказа, по первой найденной
+    причине на строку. Число строк — длина самой длинной колонки;
+    отсутствующая колонка отклоняет все строки, а строки за концом
+    короткой колонки отклоняются как неполные. Колонки целочисленных
+    полей и колонки с нечисловыми значениями проверяются через
+    `check_value`.
+    """
+    names: Tuple[str, ...] = WORKOUT_FIELDS[workout_type]
+    rows: int = max((len(arrays[name]) for name in names if name in arrays),
+                    default=0)
+    rejected: Dict[int, str] = {}
+    for name in names:
+        if name not in arrays:
+            for index in range(rows):
+                rejected.setdefault(index, f'{name}: нет колонки')
+            continue
+        column: Sequence[float] = arrays[name]
+        for index in _bad_rows(name, column):
+            if index not in rejected:
+                rejected[index] = (check_value(name, column[index])
+                                   or f'{name}: недопустимое значение')
+        for index in range(len(column), rows):
+            rejected.setdefault(index, f'{name}: нет значения')
+    return sorted(rejected.items())
+
+
+def write_dead_letter(dead_letter: TextIO, reason: str,
+                      **record: object) -> None:
+    """Записать отклонённый пакет с причиной в виде JSON-строки."""
+    import json
+
+    record['reason'] = reason
+    dead_letter.write(json.dumps(record, ensure_ascii=False,
+                                 default=repr) + '\n')
+
+
+def iter_valid(packages: Iterable[Package], dead_letter: TextIO,
+               chunk_size: int = 1000) -> Iterator[Package]:
+    """Лениво пропускать только корректные пакеты потока.
+
+    Пакеты проверяются порциями по `chunk_size` через `filter_valid`.
+    """
+    for chunk in chunked(packages, chunk_size):
+        yield from filter_valid(chunk, dead_letter)
+
+
+def filter_valid(chunk: Iterable[Package],
+                 dead_letter: TextIO) -> List[Package]:
+    """Оставить корректные пакеты порции, остальные - в `dead_letter`."""
+    valid: List[Package] = []
+    for workout_type, data in chunk:
+        reason: Optional[str] = validate_package(workout_type, data)
+        if reason is None:
+            valid.append((workout_type, data))
+        else:
+            write_dead_letter(dead_letter, reason,
+                              workout_type=workout_type, data=data)
+    return valid
@@ -0,0 +1,213 @@
+"""Альтернативные представления тренировок для бенчмарков и хранения.
+
+Слотовые классы (`SlottedRunning` и др.) расходуют меньше памяти на
+объект, классы с кэшем (`CachedRunning` и др.) запоминают рассчитанные
+значения, `WorkoutTable` хранит пакеты в колонках `array`. Модуль
+загружается при первом обращении к этим именам через `homework`.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, fields
+from typing import (ClassVar, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple, Type)
+
+from homework_core import (WORKOUT_ARITY, WORKOUT_FIELDS, WORKOUT_TYPES,
+                           InfoMessage, PackageError, Running, SportsWalking,
+                           Swimming, Training)
+from homework_types import Package
+
+
+DATACLASS_GENERATED: Tuple[str, ...] = (
+    '__dict__', '__weakref__', '__init__', '__dataclass_fields__',
+    '__dataclass_params__', '__match_args__'
+)
+
+
+def make_slotted(cls: type, base: type = object) -> type:
+    """Создать вариант датакласса `cls` со `__slots__`.
+
+    Методы и константы копируются из `cls`, предком становится `base`
+    (слотовый вариант родителя). Имя класса сохраняется, чтобы
+    сообщения о тренировках не отличались от обычных классов.
+    """
+    namespace: Dict[str, object] = {
+        name: value for name, value in vars(cls).items()
+        if name not in DATACLASS_GENERATED
+    }
+    namespace['__qualname__'] = f'Slotted{cls.__qualname__}'
+    slotted: type = type(cls.__name__, (base,), namespace)
+    return dataclass(repr=False, eq=False, slots=True)(slotted)
+
+
+def build_slotted() -> Dict[str, type]:
+    """Создать слотовые варианты сообщения и классов тренировок."""
+    info_message: type = make_slotted(InfoMessage)
+    training: type = make_slotted(Training)
+    training.INFO_MESSAGE = info_message
+    return {'SlottedInfoMessage': info_message,
+            'SlottedTraining': training,
+            'SlottedRunning': make_slotted(Running, training),
+            'SlottedSportsWalking': make_slotted(SportsWalking, training),
+            'SlottedSwimming': make_slotted(Swimming, training)}
+
+
+class CachedMetricsMixin:
+    """Запоминает дистанцию, скорость и калории тренировки.
+
+    Значения хранятся в `__dict__` экземпляра и сбрасываются при
+    изменении любого поля после создания. Конструктор записывает поля
+    прямо в `__dict__`, поэтому создание объекта не платит за сброс.
+    `show_training_info` проверяет кэш один раз и считает дистанцию и
+    скорость по одному разу, передавая их в расчёт калорий через кэш.
+
+    Для разового отчёта по новому объекту кэш — пессимизация: такой
+    отчёт медленнее, чем у исходных классов (см.
+    `benchmarks/bench_cache.py`). Кэш окупается только на повторных
+    отчётах и обращениях к одному и тому же объекту.
+    """
+
+    CACHED_METRICS: ClassVar[Tuple[str, ...]] = ('_distance', '_speed',
+                                                 '_calories', '_metrics')
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        cache: Dict[str, object] = self.__dict__
+        for metric in self.CACHED_METRICS:
+            cache.pop(metric, None)
+
+    def show_training_info(self) -> InfoMessage:
+        cache: Dict[str, object] = self.__dict__
+        metrics: Optional[Tuple[float, float, float]] = cache.get('_metrics')
+        if metrics is None:
+            distance: float = super().get_distance()
+            cache['_distance'] = distance
+            speed: float = super().get_mean_speed()
+            cache['_speed'] = speed
+            calories: float = super().get_spent_calories()
+            cache['_calories'] = calories
+            metrics = cache['_metrics'] = (distance, speed, calories)
+        return self.INFO_MESSAGE(type(self).__name__, self.duration,
+                                 *metrics)
+
+    def get_distance(self) -> float:
+        cache: Dict[str, float] = self.__dict__
+        if '_distance' not in cache:
+            cache['_distance'] = super().get_distance()
+        return cache['_distance']
+
+    def get_mean_speed(self) -> float:
+        cache: Dict[str, float] = self.__dict__
+        if '_speed' not in cache:
+            cache['_speed'] = super().get_mean_speed()
+        return cache['_speed']
+
+    def get_spent_calories(self) -> float:
+        cache: Dict[str, float] = self.__dict__
+        if '_calories' not in cache:
+            cache['_calories'] = super().get_spent_calories()
+        return cache['_calories']
+
+
+def make_cached(cls: Type[Training]) -> Type[Training]:
+    """Создать вариант класса тренировки с кэшем рассчитанных значений.
+
+    Конструктор генерируется, как это делает `dataclass`, но пишет поля
+    в `__dict__` без вызова `__setattr__`.
+    """
+    names: List[str] = [field.name for field in fields(cls)]
+    source: str = (f'def __init__(self, {", ".join(names)}):\n'
+                   f'    cache = self.__dict__\n'
+                   + ''.join(f'    cache[{name!r}] = {name}\n'
+                             for name in names))
+    namespace: Dict[str, object] = {}
+    exec(source, {}, namespace)
+    return type(cls.__name__, (CachedMetricsMixin, cls),
+                {'__qualname__': f'Cached{cls.__qualname__}',
+                 '__doc__': cls.__doc__,
+                 '__init__': namespace['__init__']})
+
+
+def build_cached() -> Dict[str, type]:
+    """Создать варианты классов тренировок с кэшем."""
+    return {'CachedRunning': make_cached(Running),
+            'CachedSportsWalking': make_cached(SportsWalking),
+            'CachedSwimming': make_cached(Swimming)}
+
+
+SlottedInfoMessage: Type[InfoMessage]
+SlottedTraining: Type[Training]
+SlottedRunning: Type[Training]
+SlottedSportsWalking: Type[Training]
+SlottedSwimming: Type[Training]
+CachedRunning: Type[Training]
+CachedSportsWalking: Type[Training]
+CachedSwimming: Type[Training]
+globals().update(build_slotted())
+globals().update(build_cached())
+
+
+class WorkoutTable:
+    """Компактное хранилище тренировок в колонках `array`.
+
+    Каждое поле тренировки хранится в отдельном буфере; поля, которых
+    нет у вида спорта, заполняются NaN.
+    """
+
+    def __init__(self) -> None:
+        self.codes: List[str] = list(WORKOUT_TYPES)
+        self.code_index: Dict[str, int] = {
+            code: index for index, code in enumerate(self.codes)
+        }
+        self.types: array = array('B')
+        self.columns: Dict[str, array] = {'action': array('q')}
+        for training_type in WORKOUT_TYPES.values():
+            for field in fields(training_type)[1:]:
+                self.columns.setdefault(field.name, array('d'))
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def append(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить пакет датчиков в таблицу.
+
+        Пакет с неизвестным кодом, неверным числом значений или
+        значениями, не подходящими колонкам, вызывает `PackageError`
+        и не меняет таблицу.
+        """
+        code: Optional[int] = self.code_index.get(workout_type)
+        if code is None:
+            raise PackageError(f'Неизвестный код тренировки: {workout_type}')
+        if len(data) != WORKOUT_ARITY[workout_type]:
+            raise PackageError(f'Для {workout_type} нужно '
+                               f'{WORKOUT_ARITY[workout_type]} значений, '
+                               f'получено {len(data)}')
+        values: Dict[str, float] = dict(zip(WORKOUT_FIELDS[workout_type],
+                                            data))
+        row: Dict[str, array] = {}
+        for name, column in self.columns.items():
+            try:
+                row[name] = array(column.typecode,
+                                  [values.get(name, math.nan)])
+            except (TypeError, OverflowError) as error:
+                raise PackageError(f'{name}: {error}') from error
+        self.types.append(code)
+        for name, column in self.columns.items():
+            column.extend(row[name])
+
+    def extend(self, packages: Iterable[Package]) -> None:
+        """Добавить в таблицу несколько пакетов."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def __getitem__(self, index: int) -> Training:
+        """Восстановить объект тренировки из строки таблицы."""
+        training_type: Type[Training] = WORKOUT_TYPES[
+            self.codes[self.types[index]]
+        ]
+        return training_type(*(self.columns[field.name][index]
+                               for field in fields(training_type)))
+
+    def __iter__(self) -> Iterator[Training]:
+        return (self[index] for index in range(len(self)))
@@ -0,0 +1,124 @@
+"""Двоичный формат пакетов датчиков.
+
+Форматы записей создаёт `register_workout` по байту типа тренировки.
+"""
+from __future__ import annotations
+
+import os
+import struct
+from array import array
+from dataclasses import fields
+from typing import (TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional,
+                    Sequence, Tuple, Union)
+
+from homework_core import (WIRE_FORMATS, WIRE_TAGS, WORKOUT_TYPES,
+                           PackageError, Training)
+from homework_types import Package
+
+if TYPE_CHECKING:
+    import mmap
+
+
+def encode_package(workout_type: str, data: Sequence[float]) -> bytes:
+    """Упаковать пакет датчиков в двоичную запись."""
+    try:
+        tag: int = WIRE_TAGS[workout_type]
+    except KeyError:
+        raise PackageError(f'Нет двоичного формата для {workout_type}')
+    try:
+        record: bytearray = bytearray(WIRE_FORMATS[tag][1].pack(*data))
+    except struct.error as error:
+        raise PackageError(f'Пакет {workout_type} {list(data)} нельзя '
+                           f'упаковать: {error}') from error
+    record[0] = tag
+    return bytes(record)
+
+
+def get_wire_format(tag: int) -> Tuple[str, struct.Struct]:
+    """Вернуть код тренировки и формат записи по байту типа."""
+    try:
+        return WIRE_FORMATS[tag]
+    except KeyError:
+        raise PackageError(f'Неизвестный байт типа записи: {tag}')
+
+
+def iter_wire_records(buffer: Union[bytes, memoryview, mmap.mmap]
+                      ) -> Iterator[Package]:
+    """Декодировать двоичные записи прямо из буфера.
+
+    Поля читаются `unpack_from` без копирования буфера, поэтому функция
+    подходит для `mmap` файлов и буферов сокетов.
+    """
+    view: memoryview = memoryview(buffer)
+    size: int = len(view)
+    offset: int = 0
+    while offset < size:
+        workout_type, record = get_wire_format(view[offset])
+        if offset + record.size > size:
+            raise PackageError(f'Обрезанная запись по смещению {offset}')
+        yield workout_type, record.unpack_from(view, offset)
+        offset += record.size
+
+
+def iter_wire_stream(stream: BinaryIO,
+                     buffer_size: int = 1 << 16) -> Iterator[Package]:
+    """Декодировать двоичные записи из файла или сокета порциями."""
+    pending: bytes = b''
+    while True:
+        chunk: bytes = stream.read(buffer_size)
+        if not chunk:
+            break
+        buffer: bytes = pending + chunk
+        view: memoryview = memoryview(buffer)
+        offset: int = 0
+        while offset < len(buffer):
+            workout_type, record = get_wire_format(buffer[offset])
+            if offset + record.size > len(buffer):
+                break
+            yield workout_type, record.unpack_from(view, offset)
+            offset += record.size
+        pending = buffer[offset:]
+    if pending:
+        raise PackageError('Поток закончился посреди записи')
+
+
+def iter_wire_file(path: str) -> Iterator[Package]:
+    """Декодировать двоичные записи из файла, отображённого в память."""
+    import mmap
+
+    with open(path, 'rb') as source:
+        if not os.fstat(source.fileno()).st_size:
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter_wire_records(mapped)
+
+
+def iter_wire_trainings(buffer: Union[bytes, memoryview, mmap.mmap]
+                        ) -> Iterator[Training]:
+    """Создать объекты тренировок из двоичных записей буфера."""
+    for workout_type, values in iter_wire_records(buffer):
+        yield WORKOUT_TYPES[workout_type](*values)
+
+
+def decode_wire_batch(buffer: Union[bytes, memoryview, mmap.mmap]
+                      ) -> Dict[str, Dict[str, array]]:
+    """Разложить двоичные записи по колонкам для `compute_batch`.
+
+    Возвращает колонки `array` отдельно для каждого кода тренировки.
+    """
+    batches: Dict[str, List[array]] = {}
+    for workout_type, values in iter_wire_records(buffer):
+        columns: Optional[List[array]] = batches.get(workout_type)
+        if columns is None:
+            columns = [array('q')] + [
+                array('d') for _ in range(len(values) - 1)
+            ]
+            batches[workout_type] = columns
+        for column, value in zip(columns, values):
+            column.append(value)
+    result: Dict[str, Dict[str, array]] = {}
+    for workout_type, columns in batches.items():
+        names: List[str] = [field.name for field
+                            in fields(WORKOUT_TYPES[workout_type])]
+        result[workout_type] = dict(zip(names, columns))
+    return result
@@ -2,6 +2,13 @@ import re
 import pytest
 import types
 import inspect
+import datetime
+import dataclasses
+import io
+import json
+import asyncio
+import threading
+import os
 from conftest import Capturing
 
 try:
@@ -363,3 +370,673 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('workout_type, packages', [
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4], [1206, 12, 6, 12, 6]]),
+    ('RUN', [[9000, 1, 75], [420, 4, 20], [1206, 12, 6]]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]]),
+])
+def test_compute_batch(workout_type, packages):
+    trainings = [homework.read_package(workout_type, data)
+                 for data in packages]
+    names = [field.name for field in dataclasses.fields(trainings[0])]
+    arrays = {name: [data[index] for data in packages]
+              for index, name in enumerate(names)}
+    result = homework.compute_batch(workout_type, arrays)
+    assert list(result['distance']) == [
+        training.get_distance() for training in trainings
+    ], 'Дистанция пакета должна совпадать с `get_distance`'
+    assert list(result['speed']) == [
+        training.get_mean_speed() for training in trainings
+    ], 'Скорость пакета должна совпадать с `get_mean_speed`'
+    assert list(result['calories']) == [
+        training.get_spent_calories() for training in trainings
+    ], 'Калории пакета должны совпадать с `get_spent_calories`'
+
+
+@pytest.mark.parametrize('fmt, text', [
+    ('json', '["SWM", [720, 1, 80, 25, 40]]\n\n'
+             '{"workout_type": "RUN", "data": [15000, 1, 75]}\n'),
+    ('csv', 'SWM,720,1,80,25,40\nRUN,15000,1,75\n'),
+])
+def test_iter_packages(fmt, text):
+    packages = list(homework.iter_packages(io.StringIO(text), fmt))
+    assert packages == [('SWM', [720, 1, 80, 25, 40]),
+                        ('RUN', [15000, 1, 75])], (
+        'Функция `iter_packages` должна возвращать пары '
+        '(код тренировки, данные).'
+    )
+
+
+def test_run_stream():
+    packages = [('SWM', [720, 1, 80, 25, 40])] * 5
+    with Capturing() as get_message_output:
+        processed = homework.run_stream(iter(packages), chunk_size=2)
+    assert processed == 5, (
+        'Функция `run_stream` должна вернуть количество пакетов.'
+    )
+    assert len(get_message_output) == 5, (
+        'Функция `run_stream` должна напечатать сообщение для каждого пакета.'
+    )
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_run_parallel(ordered):
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180])] * 4
+    expected = homework.render_chunk(packages).splitlines()
+    output = io.StringIO()
+    stats = homework.run_parallel(packages, chunk_size=5, workers=2,
+                                  ordered=ordered, output=output)
+    result = output.getvalue().splitlines()
+    if not ordered:
+        result, expected = sorted(result), sorted(expected)
+    assert result == expected, (
+        'Функция `run_parallel` должна печатать те же сообщения, что и `main`.'
+    )
+    assert (stats.packages, stats.chunks) == (12, 3), (
+        'Функция `run_parallel` должна вернуть статистику обработки.'
+    )
+
+
+@pytest.mark.parametrize('slotted_name, input_data', [
+    ('SlottedSwimming', ['SWM', [720, 1, 80, 25, 40]]),
+    ('SlottedRunning', ['RUN', [1206, 12, 6]]),
+    ('SlottedSportsWalking', ['WLK', [9000, 1, 75, 180]]),
+])
+def test_slotted_trainings(slotted_name, input_data):
+    workout_type, data = input_data
+    slotted = getattr(homework, slotted_name)(*data)
+    assert not hasattr(slotted, '__dict__'), (
+        f'У экземпляров `{slotted_name}` не должно быть `__dict__`.'
+    )
+    expected = homework.read_package(workout_type, data)
+    info = slotted.show_training_info()
+    assert isinstance(info, homework.SlottedInfoMessage), (
+        'Слотовые тренировки должны возвращать `SlottedInfoMessage`.'
+    )
+    assert info.get_message() == (
+        expected.show_training_info().get_message()
+    ), f'Сообщение `{slotted_name}` должно совпадать с обычным классом.'
+
+
+def test_workout_table():
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [1206, 12, 6]),
+                ('WLK', [9000, 1, 75, 180])]
+    table = homework.WorkoutTable()
+    table.extend(packages)
+    assert len(table) == 3, 'В таблице должно быть три тренировки.'
+    assert [training.show_training_info().get_message()
+            for training in table] == (
+        homework.render_chunk(packages).splitlines()
+    ), (
+        '`WorkoutTable` должна восстанавливать исходные тренировки.'
+    )
+    for workout_type, data in (('RUN', [15000, 1]), ('RUN', [1, 2, 3, 4]),
+                               ('RUN', [15000.5, 1, 75]), ('XXX', [1])):
+        with pytest.raises(homework.PackageError):
+            table.append(workout_type, data)
+    assert {len(column) for column in table.columns.values()} == {3}, (
+        'Некорректный пакет не должен менять таблицу.'
+    )
+
+
+def test_cached_training_invalidation():
+    training = homework.CachedRunning(9000, 1, 75)
+    assert (training.show_training_info().get_message()
+            == homework.Running(9000, 1, 75).show_training_info()
+            .get_message()), (
+        'Отчёт кэшируемого класса должен совпадать с отчётом `Running`.'
+    )
+    assert training.get_spent_calories() == 383.85, (
+        'Кэшируемый класс должен считать калории как `Running`.'
+    )
+    training.duration = 12
+    training.weight = 6
+    training.action = 1206
+    assert training.get_spent_calories() == -81.32032799999999, (
+        'Кэш должен сбрасываться при изменении полей тренировки.'
+    )
+    info = training.show_training_info()
+    assert info.training_type == 'Running', (
+        'Кэшируемый класс должен сохранять имя вида спорта.'
+    )
+    assert info.calories == -81.32032799999999, (
+        'Кэш отчёта должен сбрасываться при изменении полей тренировки.'
+    )
+    swimming = homework.CachedSwimming(action=720, duration=1, weight=80,
+                                       length_pool=25, count_pool=40)
+    assert swimming.get_spent_calories() == 336.0
+    with pytest.raises(TypeError):
+        homework.CachedRunning(9000, 1)
+
+
+@pytest.mark.parametrize('fmt, expected', [
+    ('text', 'Тип тренировки: Swimming; '
+             'Длительность: 1.000 ч.; '
+             'Дистанция: 0.994 км; '
+             'Ср. скорость: 1.000 км/ч; '
+             'Потрачено ккал: 336.000.\n'),
+    ('jsonl', '{"training_type": "Swimming", "duration": 1, '
+              '"distance": 0.9935999999999999, "speed": 1.0, '
+              '"calories": 336.0}\n'),
+    ('csv', 'training_type,duration,distance,speed,calories\n'
+            'Swimming,1,0.9935999999999999,1.0,336.0\n'),
+])
+def test_write_messages(fmt, expected):
+    infos = homework.read_infos([('SWM', [720, 1, 80, 25, 40])])
+    output = io.StringIO()
+    homework.write_messages(infos, output, fmt)
+    assert output.getvalue() == expected, (
+        f'Функция `write_messages` неверно формирует формат {fmt}.'
+    )
+
+
+def test_serve(tmp_path):
+    path = str(tmp_path / 'homework.sock')
+
+    async def scenario():
+        stop, started = asyncio.Event(), asyncio.Event()
+        server = asyncio.create_task(
+            homework.serve(path=path, stop=stop, started=started)
+        )
+        await started.wait()
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'["SWM", [720, 1, 80, 25, 40]]\n'
+                     b'["XXX", [1, 2, 3]]\n'
+                     b'{"workout_type": "RUN", "data": [15000, 1, 75]}\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        stop.set()
+        await server
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert [response.get('training_type') for response in responses] == [
+        'Swimming', None, 'Running'
+    ], 'Сервис должен отвечать на запросы в порядке их поступления.'
+    assert 'error' in responses[1], (
+        'Сервис должен возвращать ошибку для неизвестного кода тренировки.'
+    )
+
+
+def test_serve_shutdown_idle_client(tmp_path):
+    path = str(tmp_path / 'homework.sock')
+
+    async def scenario():
+        stop, started = asyncio.Event(), asyncio.Event()
+        server = asyncio.create_task(
+            homework.serve(path=path, stop=stop, started=started)
+        )
+        await started.wait()
+        reader, writer = await asyncio.open_unix_connection(path)
+        await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(server, timeout=1)
+        received = await asyncio.wait_for(reader.read(), timeout=1)
+        writer.close()
+        return received
+
+    assert asyncio.run(scenario()) == b'', (
+        'При остановке сервис должен закрывать простаивающие соединения.'
+    )
+
+
+def test_read_package_errors():
+    assert homework.read_package('XXX', [1, 2, 3]) is None, (
+        'Для неизвестного кода `read_package` должна вернуть None.'
+    )
+    with pytest.raises(homework.PackageError):
+        homework.read_package('SWM', [720, 1, 80])
+
+
+def test_register_workout():
+    @homework.register_workout('TST')
+    @dataclasses.dataclass
+    class Cycling(homework.Training):
+        def get_spent_calories(self):
+            return self.weight * self.duration
+
+    try:
+        training = homework.read_package('TST', [1000, 2, 70])
+        assert isinstance(training, Cycling), (
+            '`read_package` должна создавать зарегистрированные классы.'
+        )
+        assert homework.WORKOUT_ARITY['TST'] == 3
+        with pytest.raises(ValueError):
+            homework.register_workout('TST')(Cycling)
+        with pytest.raises(TypeError):
+            homework.register_workout('BAD')(homework.Training)
+    finally:
+        homework.WORKOUT_TYPES.pop('TST', None)
+        homework.WORKOUT_ARITY.pop('TST', None)
+        homework.WORKOUT_FIELDS.pop('TST', None)
+
+
+def test_wire_format(tmp_path):
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180])]
+    buffer = b''.join(homework.encode_package(*package)
+                      for package in packages)
+    path = tmp_path / 'packages.bin'
+    path.write_bytes(buffer)
+    for decoded in (list(homework.iter_wire_records(buffer)),
+                    list(homework.iter_wire_stream(io.BytesIO(buffer), 5)),
+                    list(homework.iter_wire_file(str(path)))):
+        assert [(code, list(data)) for code, data in decoded] == packages, (
+            'Двоичные записи должны декодироваться в исходные пакеты.'
+        )
+    columns = homework.decode_wire_batch(buffer)
+    assert list(columns['SWM']['count_pool']) == [40.0], (
+        '`decode_wire_batch` должна раскладывать поля по колонкам.'
+    )
+    with pytest.raises(homework.PackageError):
+        list(homework.iter_wire_records(buffer[:-1]))
+    for data in ([15000.0, 1, 75], [-1, 1, 75], [15000, 1]):
+        with pytest.raises(homework.PackageError):
+            homework.encode_package('RUN', data)
+
+
+def test_workout_aggregator():
+    aggregator = homework.WorkoutAggregator(rolling_days=2)
+    swimming = homework.read_package('SWM', [720, 1, 80, 25, 40])
+    running = homework.read_package('RUN', [15000, 1, 75])
+    aggregator.add_training('anna', datetime.date(2024, 1, 1), swimming)
+    aggregator.add_training('anna', datetime.date(2024, 1, 2), running)
+    aggregator.add_training('anna', datetime.date(2024, 1, 3), running)
+    assert aggregator.total('anna').count == 3
+    assert aggregator.total('anna', 'Running').distance == 19.5, (
+        'Итоги должны считаться отдельно по виду спорта.'
+    )
+    assert aggregator.daily('anna', datetime.date(2024, 1, 1)).calories == (
+        336.0
+    ), 'Итоги за день должны содержать калории тренировок этого дня.'
+    assert aggregator.weekly('anna', datetime.date(2024, 1, 7)).count == 3
+    assert aggregator.monthly('anna', datetime.date(2024, 1, 31)).count == 3
+    rolling = aggregator.rolling('anna')
+    assert (rolling.count, rolling.mean_speed) == (2, 9.75), (
+        'Скользящее окно должно вытеснять дни старше `rolling_days`.'
+    )
+    assert aggregator.total('boris').count == 0
+
+
+def test_workout_store(tmp_path):
+    path = str(tmp_path / 'store')
+    with homework.WorkoutStore(path) as store:
+        store.append(1, 300, 'RUN', [15000, 1, 75])
+        store.append(2, 100, 'SWM', [720, 1, 80, 25, 40])
+        store.flush()
+        store.append(1, 100, 'WLK', [9000, 1, 75, 180])
+        store.append(1, 900, 'RUN', [15000, 1, 75])
+    with homework.WorkoutStore(path) as store:
+        assert len(store) == 4, 'Хранилище должно сохранять все строки.'
+        rows = list(store.scan(1, 100, 900))
+        assert [store.record(row)['training_type'] for row in rows] == [
+            'SportsWalking', 'Running'
+        ], 'Выборка должна быть упорядочена по времени внутри спортсмена.'
+        assert store.aggregate(1, 0, 1000).calories == (
+            157.50000000000003 + 699.75 * 2
+        ), 'Итоги должны складывать калории строк интервала.'
+        assert store.record(rows[0])['height'] == 180.0
+        store.append(1, 200, 'RUN', [15000.0, 1, 75])
+        with pytest.raises(homework.PackageError):
+            store.append(1, 250, 'RUN', [15000.5, 1, 75])
+        store.flush()
+        assert {len(store.columns[name])
+                for name in store.typecodes} == {5}, (
+            'Отклонённая строка не должна попадать ни в одну колонку.'
+        )
+        assert len(store.index_runs) == 3
+        expected = list(store.scan(1, 0, 1000))
+        assert [store.record(row)['timestamp'] for row in expected] == [
+            100, 200, 300, 900
+        ], 'Выборка должна сливать отрезки индекса по времени.'
+        store.compact()
+        assert len(store.index_runs) == 1
+        assert list(store.scan(1, 0, 1000)) == expected
+
+
+def test_profiling(tmp_path):
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75])]
+    expected = homework.render_chunk(packages)
+    profiler = homework.enable_profiling()
+    try:
+        output = io.StringIO()
+        homework.run_stream(packages, output=output)
+        with Capturing() as get_message_output:
+            homework.main(homework.read_package(*packages[0]))
+    finally:
+        homework.disable_profiling()
+    assert output.getvalue() == expected, (
+        'Сбор метрик не должен менять вывод.'
+    )
+    assert get_message_output == expected.splitlines()[:1]
+    assert profiler.count('dispatch', 'Swimming') == 1
+    assert profiler.count('info', 'Swimming') == 2
+    assert profiler.count('calories', 'Swimming') == 2, (
+        'Калории должны считаться один раз на пакет.'
+    )
+    assert profiler.count('write') == 1
+    path = tmp_path / 'metrics.prom'
+    profiler.dump(str(path))
+    assert ('homework_stage_seconds_count{stage="dispatch",'
+            'training_type="Running"} 1') in path.read_text(), (
+        'Метрики должны выгружаться в текстовом формате Prometheus.'
+    )
+
+
+def test_result_cache():
+    now = [0.0]
+    cache = homework.ResultCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    swimming = ('SWM', [720, 1, 80, 25, 40])
+    first = cache.get_info(*swimming)
+    assert cache.get_info(*swimming) is first, (
+        'Повторный пакет должен возвращаться из кэша.'
+    )
+    assert first.get_message() == (
+        homework.read_package(*swimming).show_training_info().get_message()
+    ), 'Кэш должен возвращать то же сообщение, что и расчёт без кэша.'
+    cache.get_info('SWM', [720, 1.0, 80, 25, 40])
+    cache.get_info('RUN', [15000, 1, 75])
+    assert cache.evictions == 1 and len(cache) == 2, (
+        'Кэш должен вытеснять давно не использованные записи.'
+    )
+    now[0] = 11.0
+    cache.get_info('RUN', [15000, 1, 75])
+    assert cache.get_stats()['expirations'] == 1, (
+        'Записи старше `ttl` должны рассчитываться заново.'
+    )
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert cache.get_info('XXX', [1]) is None
+
+
+def test_handle_request_text():
+    response = homework.handle_request(b'["RUN", [1206, 12, 6]]', 'text')
+    assert response.decode() == (
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: -81.320.\n'
+    ), 'Сервис должен уметь отвечать текстом сообщения.'
+
+
+@pytest.mark.parametrize('package, reason', [
+    (('SWM', [720, 1, 80, 25, 40]), None),
+    (('XXX', [1, 2, 3]), 'Неизвестный код'),
+    (('RUN', [15000, 1]), 'нужно 3 значений'),
+    (('RUN', [15000, 0, 75]), 'duration'),
+    (('WLK', [9000, 1, 75, 0]), 'height'),
+    (('RUN', [15000, 1, '75']), 'weight'),
+    (('SWM', [720, float('inf'), 80, 25, 40]), 'duration'),
+    ((['RUN'], [15000, 1, 75]), 'строкой'),
+    (('RUN', [15000.0, 1, 75]), 'action'),
+])
+def test_validate_package(package, reason):
+    result = homework.validate_package(*package)
+    if reason is None:
+        assert result is None, 'Корректный пакет не должен отклоняться.'
+    else:
+        assert reason in result, (
+            f'Пакет {package} должен отклоняться с причиной `{reason}`.'
+        )
+
+
+def test_validate_batch():
+    rejected = homework.validate_batch('RUN', {
+        'action': [15000, -1, 15000],
+        'duration': [1, 1, 0],
+        'weight': [75, 75, 75],
+    })
+    assert [index for index, _ in rejected] == [1, 2], (
+        '`validate_batch` должна вернуть номера некорректных строк.'
+    )
+    rejected = homework.validate_batch('RUN', {
+        'action': [15000, 15000.0],
+        'duration': [1, 1],
+        'weight': [75, 75],
+    })
+    assert [index for index, _ in rejected] == [1], (
+        '`action` должен быть целым числом.'
+    )
+    rejected = homework.validate_batch('RUN', {'action': [1],
+                                               'duration': [1]})
+    assert rejected == [(0, 'weight: нет колонки')], (
+        'Отсутствующая колонка должна быть причиной отказа.'
+    )
+    rejected = homework.validate_batch('RUN', {
+        'action': [15000, 15000],
+        'duration': [1],
+        'weight': [75, 75],
+    })
+    assert rejected == [(1, 'duration: нет значения')], (
+        'Строки за концом короткой колонки должны отклоняться.'
+    )
+
+
+def test_run_stream_dead_letter():
+    text = ('["SWM", [720, 1, 80, 25, 40]]\n'
+            'not json\n'
+            '["RUN", [15000, 0, 75]]\n'
+            '[["RUN"], [1, 2, 3]]\n')
+    dead_letter = io.StringIO()
+    output = io.StringIO()
+    processed = homework.run_stream(
+        homework.iter_packages(io.StringIO(text), 'json', dead_letter),
+        output=output, dead_letter=dead_letter
+    )
+    assert processed == 1 and len(output.getvalue().splitlines()) == 1, (
+        'Некорректные пакеты не должны прерывать обработку.'
+    )
+    reasons = [json.loads(line)['reason']
+               for line in dead_letter.getvalue().splitlines()]
+    assert len(reasons) == 3 and 'duration' in reasons[1], (
+        'Отклонённые пакеты должны попадать в `dead_letter` с причиной.'
+    )
+
+
+def test_get_report():
+    training = homework.read_package('SWM', [720, 1, 80, 25, 40])
+    with Capturing() as get_message_output:
+        report = homework.get_report(training)
+    assert get_message_output == [], '`get_report` не должна печатать.'
+    assert report == training.show_training_info().get_message()
+
+
+def test_concurrent_stress():
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [1206, 12, 6]),
+                ('WLK', [9000, 1, 75, 180])] * 200
+    expected = homework.render_chunk(packages).splitlines()
+    shared = [homework.read_package(*package) for package in packages[:3]]
+    shared_expected = expected[:3]
+    errors = []
+
+    def hammer():
+        for _ in range(50):
+            for training, message in zip(shared, shared_expected):
+                if homework.get_report(training) != message:
+                    errors.append(message)
+
+    threads = [threading.Thread(target=hammer) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    result = homework.process_concurrently(packages, max_workers=16)
+    for thread in threads:
+        thread.join()
+    assert result == expected, (
+        '`process_concurrently` должна возвращать сообщения по порядку.'
+    )
+    assert not errors, 'Общие объекты должны читаться из потоков без ошибок.'
+
+
+@pytest.mark.parametrize('workout_type, data, extra', [
+    ('RUN', [15000, 1, 75], {}),
+    ('WLK', [9000, 1, 75, 180], {'height': 180}),
+    ('SWM', [720, 1, 80, 25, 40], {'length_pool': 25, 'count_pool': 0}),
+])
+def test_interval_tracker(workout_type, data, extra):
+    tracker = homework.IntervalTracker(workout_type, data[2], **extra)
+    assert tracker.feed(0, 0) is None
+    for second in range(600, 3601, 600):
+        updates = {'count_pool': 40 * second // 3600} if extra.get(
+            'length_pool') else {}
+        sample = tracker.feed(second, data[0] * second // 3600, **updates)
+    total = homework.read_package(workout_type, data)
+    assert sample.calories == total.get_spent_calories(), (
+        'Калории к концу потока должны совпадать с итогом тренировки.'
+    )
+    assert sample.mean_speed == total.get_mean_speed()
+    assert sample.splits == int(total.get_mean_speed()), (
+        'Число отрезков должно соответствовать пройденной дистанции.'
+    )
+    with pytest.raises(ValueError):
+        tracker.feed(3600, data[0])
+
+
+def test_run_coordinator(tmp_path, monkeypatch):
+    import homework_shards
+
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [1206, 12, 6]),
+                ('WLK', [9000, 1, 75, 180])] * 10
+    marker = tmp_path / 'failed-once'
+    render_chunk = homework.render_chunk
+
+    def flaky_render_chunk(chunk, fmt='text'):
+        if not marker.exists():
+            marker.touch()
+            raise RuntimeError('сбой рабочего процесса')
+        return render_chunk(chunk, fmt)
+
+    monkeypatch.setattr(homework_shards, 'render_chunk', flaky_render_chunk)
+    output = io.StringIO()
+    stats = homework.run_coordinator(packages, str(tmp_path / 'work'),
+                                     workers=3, shard_size=4,
+                                     output=output)
+    assert output.getvalue() == render_chunk(packages), (
+        'Координатор должен склеивать результаты шардов по порядку.'
+    )
+    assert (stats.packages, stats.chunks) == (30, 8)
+    with pytest.raises(homework.PackageError):
+        homework.run_coordinator([('RUN', [1, 2])], str(tmp_path / 'bad'),
+                                 workers=1, retries=1,
+                                 output=io.StringIO())
+    dead_letter = io.StringIO()
+    output = io.StringIO()
+    stats = homework.run_coordinator(packages[:3] + [('RUN', [1, 2])],
+                                     str(tmp_path / 'checked'), workers=1,
+                                     output=output, dead_letter=dead_letter)
+    assert output.getvalue() == render_chunk(packages[:3]), (
+        'Некорректный пакет должен уходить в `dead_letter`, а не в шард.'
+    )
+    assert stats.packages == 3 and len(dead_letter.getvalue().splitlines()) == 1
+
+
+def test_requeue_shards_lease(tmp_path, monkeypatch):
+    import homework_shards
+
+    work_dir = str(tmp_path / 'work')
+    homework.split_shards([('RUN', [15000, 1, 75])] * 3, work_dir, 1)
+    claimed = tmp_path / 'work' / 'claimed'
+    for index, worker in enumerate(('remote-1', 'remote-2', 'local-3')):
+        shard = f'{index:08d}.jsonl'
+        os.replace(tmp_path / 'work' / 'todo' / shard,
+                   claimed / f'{shard}.{worker}')
+    os.utime(claimed / '00000001.jsonl.remote-2', (0, 0))
+    attempts = {}
+    assert homework.requeue_shards(work_dir, attempts, 1, {'local-3'},
+                                   lease=60) == 2, (
+        'В очередь должны вернуться только просроченные захваты и '
+        'захваты завершившихся рабочих.'
+    )
+    assert os.listdir(claimed) == ['00000000.jsonl.remote-1'], (
+        'Живой захват другого рабочего должен остаться на месте.'
+    )
+    assert '00000000.jsonl' not in attempts
+
+    render_chunk = homework.render_chunk
+
+    def lose_claim(chunk, fmt='text'):
+        for name in os.listdir(claimed):
+            os.remove(claimed / name)
+        return render_chunk(chunk, fmt)
+
+    monkeypatch.setattr(homework_shards, 'render_chunk', lose_claim)
+    assert homework.run_worker(work_dir) == 0, (
+        'Рабочий должен пропускать шарды с отобранным захватом.'
+    )
+    assert os.listdir(tmp_path / 'work' / 'done') == []
+    assert os.listdir(tmp_path / 'work' / 'failed') == []
+
+
+def test_differential_engines():
+    from benchmarks import differential
+
+    assert differential.ulp_distance(1.0, 1.0) == 0
+    assert differential.ulp_distance(1.0, 1.0 + 2 ** -52) == 1
+    assert differential.ulp_distance(-0.0, 0.0) == 0
+    assert differential.ulp_distance(-5e-324, 5e-324) == 2
+    reports = differential.run(3_000, ['batch', 'cached', 'slotted'],
+                               chunk_size=1_000)
+    for name in ('batch', 'cached', 'slotted'):
+        report = reports[name]
+        assert report.packages == 3_000
+        assert report.max_ulp == dict.fromkeys(differential.METRICS, 0), (
+            f'Движок {name} должен побитово совпадать с эталоном.'
+        )
+        assert report.message_mismatches == 0
+        assert report.packages_per_second > 0
+
+
+@pytest.mark.parametrize('compression', homework.COLUMNAR_COMPRESSIONS)
+def test_columnar_export(tmp_path, compression):
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180])] * 5
+    path = str(tmp_path / 'results.col')
+    rows = homework.export_columnar(packages, path, batch_size=4,
+                                    compression=compression)
+    assert rows == 15
+    with open(path, 'rb') as stream:
+        batches = list(homework.iter_columnar(stream))
+    assert [len(batch['speed']) for batch in batches] == [4, 4, 4, 3], (
+        'Выгрузка должна записываться блоками по batch_size строк.'
+    )
+    exported = [
+        tuple(batch[name][row] for name in homework.INFO_FIELDS)
+        for batch in batches for row in range(len(batch['speed']))
+    ]
+    assert exported == [info.as_row()
+                        for info in homework.read_infos(packages)], (
+        'Поля сообщения должны выгружаться без округления.'
+    )
+    assert batches[0]['length_pool'][0] == 25
+    assert batches[0]['action'][1] == 15000
+    assert batches[0]['height'][1] != batches[0]['height'][1], (
+        'Поля, которых нет у вида спорта, должны быть NaN.'
+    )
+    with pytest.raises(homework.PackageError):
+        homework.ColumnarWriter(io.BytesIO()).write_chunk([('RUN', [1, 2])])
+    buffer = io.BytesIO()
+    writer = homework.ColumnarWriter(buffer, compression=compression)
+    with pytest.raises(ZeroDivisionError):
+        writer.write_chunk([('RUN', [15000, 0, 75])])
+    writer.write_chunk([('RUN', [15000, 1, 75])])
+    writer.close()
+    buffer.seek(0)
+    [batch] = homework.iter_columnar(buffer)
+    assert {len(column) for column in batch.values()} == {1}, (
+        'Строка с ошибкой расчёта не должна попадать в блок.'
+    )
+    broken = str(tmp_path / 'broken.col')
+    with pytest.raises(homework.PackageError):
+        homework.export_columnar(packages + [('RUN', [1, 2])], broken,
+                                 batch_size=4, compression=compression)
+    with open(broken, 'rb') as stream, pytest.raises(ValueError):
+        list(homework.iter_columnar(stream))